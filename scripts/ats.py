@@ -0,0 +1,306 @@
+# scripts/ats.py
+from __future__ import annotations
+import json, os, sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from fetcher import Fetcher
+from locations import is_canadian
+from records import Posting
+
+# One adapter per applicant-tracking system. An adapter turns a `boards:`
+# entry from filters.yaml into a Board, yields the board's raw jobs one page at
+# a time, and maps each raw job to a Posting. The scraper filters every page as
+# it arrives, so a 5,000-job employer board is never held in memory at once.
+#
+# Entries are either a bare slug or a mapping with `slug` (or a legacy `board`
+# URL), an optional display `name`, and adapter options:
+#   workday:          host (default {slug}.wd3.myworkdayjobs.com), tenant (default slug),
+#                     site (default External), search (Workday searchText)
+#   taleo:            host (default {slug}.taleo.net), portal, section
+#   smartrecruiters:  none
+# e.g.  workday: [{slug: hydroone, name: Hydro One, host: hydroone.wd3.myworkdayjobs.com, site: HydroOne}]
+
+# ATS API roots; point these at a local stand-in (scripts/benchmark.py scrape) for load tests
+GREENHOUSE_API = os.environ.get("GREENHOUSE_API", "https://api.greenhouse.io")
+LEVER_API = os.environ.get("LEVER_API", "https://api.lever.co")
+ASHBY_API = os.environ.get("ASHBY_API", "https://api.ashbyhq.com")
+SMARTRECRUITERS_API = os.environ.get("SMARTRECRUITERS_API", "https://api.smartrecruiters.com")
+
+PAGE_WORKERS = 4        # concurrent page requests per paginated board
+MAX_PAGES = 250         # stop runaway pagination on a misbehaving endpoint
+
+@dataclass(frozen=True)
+class Board:
+    source: str
+    slug: str
+    name: Optional[str] = None                  # display name; adapters fall back to the payload's
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def key(self) -> str:
+        return sys.intern(f"{self.source}:{self.slug}")
+
+    @property
+    def label(self) -> str:
+        return self.name or self.slug.replace("-", " ").replace("_", " ").title()
+
+    def opt(self, key: str, default: Any = None) -> Any:
+        return dict(self.options).get(key, default)
+
+class Adapter:
+    """Base class; subclasses set `source` and implement pages() and to_posting()."""
+    source = ""
+
+    def board(self, entry: Any) -> Optional[Board]:
+        if isinstance(entry, str):
+            return Board(self.source, entry.strip()) if entry.strip() else None
+        if not isinstance(entry, dict):
+            return None
+        slug = entry.get("slug") or str(entry.get("board") or "").rstrip("/").split("/")[-1]
+        if not slug:
+            return None
+        opts = tuple(sorted((k, v) for k, v in entry.items() if k not in ("slug", "board", "name")))
+        return Board(self.source, slug, entry.get("name"), opts)
+
+    def pages(self, board: Board, fetcher: Fetcher) -> Iterator[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+    def to_posting(self, job: Dict[str, Any], board: Board) -> Posting:
+        raise NotImplementedError
+
+ADAPTERS: Dict[str, Adapter] = {}
+
+def register(cls):
+    ADAPTERS[cls.source] = cls()
+    return cls
+
+def _posting(company: str, title: str, loc: Optional[str], url: Any) -> Posting:
+    return Posting(company=company, role=title or "", location=loc,
+                   country="Canada" if is_canadian(loc) else None, url=url)
+
+def paged(fetcher: Fetcher, fetch, page_size: int, first: Tuple[List[Dict[str, Any]], int]) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the first page, then the remaining offsets fetched PAGE_WORKERS at a
+    time. `first` is (items, total); `fetch(offset)` returns one page's items.
+    Page requests share the Fetcher's global `workers` cap with every board.
+    """
+    items, total = first
+    yield items
+    offsets = list(range(page_size, min(total, page_size * MAX_PAGES), page_size))
+    for i in range(0, len(offsets), PAGE_WORKERS):
+        for page, err, _ in fetcher.map(fetch, offsets[i:i + PAGE_WORKERS]):
+            if err is not None:
+                raise err
+            if page:
+                yield page
+
+# ---- Greenhouse / Lever (one page per board) ----
+
+def gh_fetch(board: str, fetcher: Fetcher | None = None) -> List[Dict[str, Any]]:
+    # Greenhouse board: https://api.greenhouse.io/v1/boards/{board}/jobs
+    url = f"{GREENHOUSE_API}/v1/boards/{board}/jobs"
+    if fetcher:
+        data = fetcher.get_json(url) or {}
+    else:
+        r = requests.get(url, timeout=20)
+        r.raise_for_status()
+        data = r.json() or {}
+    return data.get("jobs", [])
+
+def gh_to_posting(j: Dict[str, Any], company_label: str) -> Posting:
+    title = j.get("title") or ""
+    # location may be dict or list
+    loc = None
+    locs = j.get("location")
+    if isinstance(locs, dict):
+        loc = locs.get("name")
+    elif isinstance(locs, list) and locs:
+        loc = (locs[0] or {}).get("name")
+    apply_url = j.get("absolute_url") or j.get("url") or j.get("internal_job_id")
+    return _posting(company_label, title, loc, apply_url)
+
+def lever_fetch(company_slug: str, fetcher: Fetcher | None = None) -> List[Dict[str, Any]]:
+    # Lever: https://api.lever.co/v0/postings/{company}?mode=json
+    url = f"{LEVER_API}/v0/postings/{company_slug}?mode=json"
+    if fetcher:
+        return fetcher.get_json(url) or []
+    r = requests.get(url, timeout=20)
+    r.raise_for_status()
+    return r.json() or []
+
+def lever_to_posting(j: Dict[str, Any], company_label: str) -> Posting:
+    title = j.get("text") or j.get("title") or ""
+    loc = None
+    if j.get("categories"):
+        loc = j["categories"].get("location")
+    if not loc:
+        locs = j.get("workTypes") or j.get("locations") or []
+        if isinstance(locs, list) and locs:
+            cand = locs[0]
+            if isinstance(cand, dict):
+                loc = cand.get("name")
+            elif isinstance(cand, str):
+                loc = cand
+    apply_url = j.get("hostedUrl") or j.get("applyUrl") or j.get("url")
+    return _posting(company_label, title, loc, apply_url)
+
+@register
+class Greenhouse(Adapter):
+    source = "greenhouse"
+
+    def pages(self, board, fetcher):
+        yield gh_fetch(board.slug, fetcher)
+
+    def to_posting(self, job, board):
+        return gh_to_posting(job, board.label)
+
+@register
+class Lever(Adapter):
+    source = "lever"
+
+    def pages(self, board, fetcher):
+        yield lever_fetch(board.slug, fetcher)
+
+    def to_posting(self, job, board):
+        return lever_to_posting(job, board.label)
+
+# ---- Ashby: https://api.ashbyhq.com/posting-api/job-board/{slug} (one page) ----
+
+@register
+class Ashby(Adapter):
+    source = "ashby"
+
+    def pages(self, board, fetcher):
+        data = fetcher.get_json(f"{ASHBY_API}/posting-api/job-board/{board.slug}") or {}
+        yield [j for j in data.get("jobs") or [] if j.get("isListed", True)]
+
+    def to_posting(self, job, board):
+        addr = (job.get("address") or {}).get("postalAddress") or {}
+        loc = ", ".join(filter(None, (addr.get("addressLocality"), addr.get("addressRegion"),
+                                      addr.get("addressCountry")))) or job.get("location")
+        if not is_canadian(loc):
+            # multi-site postings: prefer a Canadian secondary location if there is one
+            for sec in job.get("secondaryLocations") or []:
+                cand = sec.get("location") if isinstance(sec, dict) else sec
+                if is_canadian(cand):
+                    loc = cand
+                    break
+        return _posting(board.label, job.get("title"), loc, job.get("jobUrl") or job.get("applyUrl"))
+
+# ---- SmartRecruiters: /v1/companies/{slug}/postings?limit=&offset= (offset pages) ----
+
+@register
+class SmartRecruiters(Adapter):
+    source = "smartrecruiters"
+    page_size = 100
+
+    def pages(self, board, fetcher):
+        base = f"{SMARTRECRUITERS_API}/v1/companies/{board.slug}/postings?limit={self.page_size}"
+        def fetch(offset: int) -> List[Dict[str, Any]]:
+            return (fetcher.get_json(f"{base}&offset={offset}") or {}).get("content") or []
+        data = fetcher.get_json(f"{base}&offset=0") or {}
+        yield from paged(fetcher, fetch, self.page_size,
+                         (data.get("content") or [], int(data.get("totalFound") or 0)))
+
+    def to_posting(self, job, board):
+        where = job.get("location") or {}
+        loc = where.get("fullLocation")
+        if not loc:
+            country = where.get("country") or ""
+            loc = ", ".join(filter(None, (where.get("city"), where.get("region"),
+                                          "Canada" if country.lower() == "ca" else country.upper())))
+        company = board.name or (job.get("company") or {}).get("name") or board.label
+        url = job.get("postingUrl") or f"https://jobs.smartrecruiters.com/{board.slug}/{job.get('id')}"
+        return _posting(company, job.get("name"), loc or None, url)
+
+# ---- Workday: POST https://{host}/wday/cxs/{tenant}/{site}/jobs (offset pages of 20) ----
+
+@register
+class Workday(Adapter):
+    source = "workday"
+    page_size = 20          # the CXS endpoint rejects larger pages
+
+    def _site(self, board: Board) -> Tuple[str, str]:
+        host = board.opt("host") or f"{board.slug}.wd3.myworkdayjobs.com"
+        return host, board.opt("site") or "External"
+
+    def pages(self, board, fetcher):
+        host, site = self._site(board)
+        url = f"https://{host}/wday/cxs/{board.opt('tenant') or board.slug}/{site}/jobs"
+        def fetch(offset: int) -> List[Dict[str, Any]]:
+            body = {"appliedFacets": {}, "limit": self.page_size, "offset": offset,
+                    "searchText": board.opt("search") or ""}
+            return fetcher.post_json(url, body) or {}
+        data = fetch(0)
+        # only the first page reports the total
+        yield from paged(fetcher, lambda o: fetch(o).get("jobPostings") or [], self.page_size,
+                         (data.get("jobPostings") or [], int(data.get("total") or 0)))
+
+    def to_posting(self, job, board):
+        host, site = self._site(board)
+        path = job.get("externalPath") or ""
+        return _posting(board.label, job.get("title"), job.get("locationsText"),
+                        f"https://{host}/{site}{path}" if path else None)
+
+# ---- Taleo: POST https://{host}/careersection/rest/jobboard/searchjobs (numbered pages) ----
+
+@register
+class Taleo(Adapter):
+    source = "taleo"
+
+    def _host(self, board: Board) -> str:
+        return board.opt("host") or f"{board.slug}.taleo.net"
+
+    def pages(self, board, fetcher):
+        url = f"https://{self._host(board)}/careersection/rest/jobboard/searchjobs?lang=en"
+        if board.opt("portal"):
+            url += f"&portal={board.opt('portal')}"
+        seen = 0
+        for page_no in range(1, MAX_PAGES + 1):
+            data = fetcher.post_json(url, {
+                "multilineEnabled": False,
+                "sortingSelection": {"sortBySelectionParam": "3", "ascendingSortingOrder": "false"},
+                "fieldData": {"fields": {"KEYWORD": "", "LOCATION": ""}, "valid": True},
+                "filterSelectionParam": {"searchFilterSelections": []},
+                "advancedSearchFiltersSelectionParam": {"searchFilterSelections": []},
+                "pageNo": page_no,
+            }) or {}
+            items = data.get("requisitionList") or []
+            if not items:
+                return
+            yield items
+            seen += len(items)
+            if seen >= int((data.get("pagingData") or {}).get("totalCount") or 0):
+                return
+
+    def to_posting(self, job, board):
+        cols = job.get("column") or []
+        title = cols[0] if cols else ""
+        loc = cols[1] if len(cols) > 1 else None
+        if isinstance(loc, str) and loc.startswith("["):
+            # multi-location requisitions come back as a JSON list in the column
+            try:
+                places = json.loads(loc)
+                loc = next((p for p in places if is_canadian(p)), places[0] if places else None)
+            except ValueError:
+                pass
+        section = board.opt("section") or "2"
+        url = f"https://{self._host(board)}/careersection/{section}/jobdetail.ftl?job={job.get('contestNo') or job.get('jobId')}"
+        return _posting(board.label, title, loc, url)
+
+def board_tasks(cfg: Dict[str, Any]) -> List[Board]:
+    """Every board under `boards:` in filters.yaml, in config order."""
+    tasks = []
+    for source, entries in (cfg.get("boards") or {}).items():
+        adapter = ADAPTERS.get(source)
+        if adapter is None:
+            print(f"[warn] no adapter for '{source}' boards; skipping {len(entries or [])}")
+            continue
+        for entry in entries or []:
+            board = adapter.board(entry)
+            if board is not None:
+                tasks.append(board)
+    return tasks
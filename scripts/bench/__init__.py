@@ -0,0 +1,3 @@
+# scripts/bench/__init__.py
+# Offline benchmark suite: synthetic data (generate.py), per-stage workloads
+# (stages.py) and the runner/baseline comparison in scripts/benchmark.py.
@@ -0,0 +1,135 @@
+# scripts/bench/ats_server.py
+from __future__ import annotations
+import hashlib, json, random, re, threading, time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from bench.generate import greenhouse_payload, lever_payload
+
+# Local stand-in for the Greenhouse and Lever job board APIs, serving the
+# same URL shapes the scraper requests from generated fixtures:
+#   GET /v1/boards/{board}/jobs          (Greenhouse)
+#   GET /v0/postings/{slug}?mode=json    (Lever)
+# Any slug exists; its payload is derived from the slug and seed, so runs are
+# repeatable. Latency, 5xx errors, 429s and oversized boards are injected at
+# the configured rates.
+
+GH_PATH = re.compile(r"^/v1/boards/([^/?]+)/jobs/?$")
+LEVER_PATH = re.compile(r"^/v0/postings/([^/?]+)/?$")
+
+@dataclass
+class Faults:
+    latency_ms: float = 0.0        # added to every response
+    jitter_ms: float = 0.0         # uniform extra delay in [0, jitter_ms]
+    error_rate: float = 0.0        # share of requests answered 500/502/503
+    rate_429: float = 0.0          # share of requests answered 429
+    retry_after: Optional[float] = 1.0   # Retry-After seconds on 429s (None: omit the header)
+    jobs: int = 40                 # postings per board
+    huge_rate: float = 0.0         # share of boards that are oversized
+    huge_jobs: int = 20_000        # postings on an oversized board
+    seed: int = 0
+
+def _share(key: str, seed: int) -> float:
+    """Stable value in [0, 1) per key, so a board is always (or never) huge."""
+    h = hashlib.blake2b(f"{seed}:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(h, "big") / 2**64
+
+class ATSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: Tuple[str, int], faults: Faults):
+        super().__init__(addr, Handler)
+        self.faults = faults
+        self.rnd = random.Random(faults.seed)
+        self.lock = threading.Lock()
+        self.bodies: Dict[str, Tuple[bytes, str]] = {}
+        self.statuses: Counter = Counter()
+        self.last_status: Dict[str, int] = {}   # board path -> status of its latest response
+        self.hits: Counter = Counter()          # board path -> requests
+        self.bytes_sent = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def body(self, kind: str, slug: str) -> Tuple[bytes, str]:
+        key = f"{kind}:{slug}"
+        with self.lock:
+            cached = self.bodies.get(key)
+        if cached:
+            return cached
+        f = self.faults
+        n = f.huge_jobs if _share(key, f.seed) < f.huge_rate else f.jobs
+        payload = greenhouse_payload(slug, n, f.seed) if kind == "gh" else lever_payload(slug, n, f.seed)
+        raw = json.dumps(payload).encode("utf-8")
+        entry = (raw, '"%s"' % hashlib.sha1(raw).hexdigest())
+        with self.lock:
+            self.bodies[key] = entry
+        return entry
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.rnd.random()
+
+    def record(self, path: str, status: int, size: int) -> None:
+        with self.lock:
+            self.statuses[status] += 1
+            self.last_status[path] = status
+            self.hits[path] += 1
+            self.bytes_sent += size
+
+    def stats(self) -> Dict[str, object]:
+        with self.lock:
+            failed = sorted(p for p, s in self.last_status.items() if s not in (200, 304))
+            return {"requests": sum(self.statuses.values()), "statuses": dict(sorted(self.statuses.items())),
+                    "boards": len(self.last_status), "failed_boards": failed, "bytes": self.bytes_sent,
+                    "hits": dict(self.hits)}
+
+class Handler(BaseHTTPRequestHandler):
+    server: ATSServer
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real APIs
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.server.record(self.path.split("?")[0], status, len(body))
+
+    def do_GET(self) -> None:
+        path = self.path.split("?")[0]
+        gh, lever = GH_PATH.match(path), LEVER_PATH.match(path)
+        if not gh and not lever:
+            return self._send(404, b'{"error": "not found"}', {"Content-Type": "application/json"})
+
+        f = self.server.faults
+        delay = f.latency_ms + (self.server.roll() * f.jitter_ms if f.jitter_ms else 0.0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        roll = self.server.roll()
+        if roll < f.rate_429:
+            headers = {"Retry-After": f"{f.retry_after:g}"} if f.retry_after is not None else {}
+            return self._send(429, b'{"error": "rate limited"}', headers)
+        if roll < f.rate_429 + f.error_rate:
+            return self._send((500, 502, 503)[int(self.server.roll() * 3)], b'{"error": "upstream"}')
+
+        body, etag = self.server.body("gh" if gh else "lever", (gh or lever).group(1))
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag})
+        self._send(200, body, {"Content-Type": "application/json", "ETag": etag})
+
+def start(faults: Faults, host: str = "127.0.0.1", port: int = 0) -> ATSServer:
+    """Start a server on a background thread; port 0 picks a free port. Call .shutdown() when done."""
+    srv = ATSServer((host, port), faults)
+    threading.Thread(target=srv.serve_forever, name=f"ats-{srv.server_address[1]}", daemon=True).start()
+    return srv
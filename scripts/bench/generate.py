@@ -0,0 +1,119 @@
+# scripts/bench/generate.py
+from __future__ import annotations
+import random
+from typing import Any, Dict, Iterator, List
+
+# Deterministic synthetic data: the same (n, seed) always yields the same rows,
+# so benchmark runs on different days/machines measure the same workload.
+
+COMPANIES = [
+    "Shopify", "Wealthsimple", "KOHO", "Hydro One", "Ontario Power Generation", "BC Hydro", "Enbridge",
+    "Suncor", "WSP", "Stantec", "Hatch", "AECOM", "MDA", "Pratt & Whitney Canada", "Deloitte", "KPMG",
+    "PwC", "EY", "Torys", "Osler, Hoskin & Harcourt", "RBC", "BMO", "Scotiabank", "CIBC", "Bell",
+    "Ford Canada", "Toyota Motor Manufacturing Canada", "Honda of Canada Mfg.", "Geotab", "Ada",
+] + [f"Synthetic Co {i}" for i in range(200)]
+
+CANADIAN = [
+    "Toronto, ON", "Ottawa, ON", "Waterloo, ON", "Mississauga, ON", "Montréal, QC", "Quebec City, QC",
+    "Vancouver, BC", "Burnaby, BC", "Calgary, AB", "Edmonton, AB", "Winnipeg, MB", "Regina, SK",
+    "Halifax, NS", "Fredericton, NB", "St. John’s, NL", "Remote - Canada", "Canada", "Ontario",
+    "Toronto, Ontario, Canada", "Ottawa, ON K1A 0B1",
+]
+ELSEWHERE = [
+    "San Francisco, CA", "New York, NY", "Boston, MA", "London, UK", "Austin, TX", "Remote - USA",
+    "Berlin, Germany", "Dublin, Ireland", "Seattle, WA", "Remote",
+]
+DISCIPLINES = ["Software", "Electrical", "Mechanical", "Civil", "Chemical", "Data Science", "Machine Learning",
+               "Embedded Firmware", "Aerospace", "Mining", "Robotics", "Process", "Legal", "Finance",
+               "Business Analyst", "Consulting", "Supply Chain", "Quality", "Structural", "Power Systems"]
+INTERN_WORDS = ["Intern", "Co-op", "Internship", "Summer Student", "Co-op Student", "Placement"]
+OTHER_WORDS = ["Engineer", "Senior Engineer", "Manager", "Analyst", "Director", "Specialist"]
+TERMS = ["", " (Summer 2026)", " - Fall 2026", " (4 months)", " - Winter 2027", " (8-16 months)"]
+TAGS = ["software", "electrical", "mechanical", "civil", "chemical", "data-ml-ai", "hardware-embedded",
+        "aerospace", "mining", "law", "consulting", "business", "industrial", "mechatronics"]
+
+def _title(rnd: random.Random, intern: bool) -> str:
+    word = rnd.choice(INTERN_WORDS if intern else OTHER_WORDS)
+    return f"{rnd.choice(DISCIPLINES)} {word}{rnd.choice(TERMS)}"
+
+def _location(rnd: random.Random) -> str:
+    return rnd.choice(CANADIAN) if rnd.random() < 0.6 else rnd.choice(ELSEWHERE)
+
+def greenhouse_payload(board: str, n: int, seed: int = 0) -> Dict[str, Any]:
+    """Body of GET /v1/boards/{board}/jobs."""
+    rnd = random.Random(f"gh:{board}:{seed}")
+    jobs = []
+    for i in range(n):
+        jid = 4_000_000 + rnd.randrange(1_000_000)
+        jobs.append({
+            "id": jid,
+            "internal_job_id": jid - 1000,
+            "title": _title(rnd, rnd.random() < 0.4),
+            "updated_at": f"2026-0{rnd.randint(1, 9)}-{rnd.randint(10, 28)}T12:00:00-04:00",
+            "location": {"name": _location(rnd)},
+            "absolute_url": f"https://boards.greenhouse.io/{board}/jobs/{jid}?gh_jid={jid}",
+            "metadata": None,
+            "requisition_id": f"REQ-{i:05d}",
+        })
+    return {"jobs": jobs, "meta": {"total": n}}
+
+def lever_payload(slug: str, n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Body of GET /v0/postings/{slug}?mode=json."""
+    rnd = random.Random(f"lever:{slug}:{seed}")
+    out = []
+    for i in range(n):
+        pid = f"{rnd.getrandbits(32):08x}-{i:04x}-4{rnd.getrandbits(12):03x}-a000-{rnd.getrandbits(48):012x}"
+        out.append({
+            "id": pid,
+            "text": _title(rnd, rnd.random() < 0.4),
+            "categories": {"location": _location(rnd), "team": rnd.choice(DISCIPLINES),
+                           "commitment": rnd.choice(["Intern", "Full-time", "Co-op"])},
+            "hostedUrl": f"https://jobs.lever.co/{slug}/{pid}",
+            "applyUrl": f"https://jobs.lever.co/{slug}/{pid}/apply",
+            "createdAt": 1_750_000_000_000 + rnd.randrange(10**10),
+            "descriptionPlain": "Synthetic posting.",
+        })
+    return out
+
+def raw_postings(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Scraper-shaped rows before normalization: mixed locations, titles, ~5% exact repeats."""
+    rnd = random.Random(f"raw:{n}:{seed}")
+    recent: List[Dict[str, Any]] = []
+    for i in range(n):
+        if recent and rnd.random() < 0.05:
+            yield dict(rnd.choice(recent))
+            continue
+        company = rnd.choice(COMPANIES)
+        r = {
+            "company": company,
+            "role": _title(rnd, rnd.random() < 0.7),
+            "location": _location(rnd),
+            "country": None,
+            "deadline": rnd.choice([None, None, f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"]),
+            "status": rnd.choice(["Open", "Open", "Open", "Closed", "filled"]),
+            "tags": rnd.sample(TAGS, rnd.randint(0, 2)),
+            "url": f"https://jobs.example.com/{company.split()[0].lower()}/{i}",
+            "level": None,
+            "board": f"greenhouse:{company.split()[0].lower()}",
+        }
+        if len(recent) < 1000:
+            recent.append(r)
+        yield r
+
+def normalized_postings(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Rows shaped like normalize.py output (all Canadian, bucket tags, level set)."""
+    rnd = random.Random(f"norm:{n}:{seed}")
+    for i in range(n):
+        company = rnd.choice(COMPANIES)
+        yield {
+            "company": company,
+            "role": _title(rnd, True),
+            "location": rnd.choice(CANADIAN),
+            "country": "Canada",
+            "deadline": rnd.choice(["Rolling/unspecified", f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"]),
+            "status": rnd.choice(["Open", "Open", "Closed"]),
+            "tags": sorted(rnd.sample(TAGS, rnd.randint(1, 3))),
+            "url": f"https://jobs.example.com/{company.split()[0].lower()}/{i}",
+            "level": rnd.choice(["Undergraduate", "Undergraduate", "Graduate"]),
+            "board": f"greenhouse:{company.split()[0].lower()}",
+        }
@@ -0,0 +1,65 @@
+# scripts/bench/scrape_load.py
+from __future__ import annotations
+import contextlib, io, tempfile, time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bench.ats_server import Faults, start
+
+# Drives scraper.scrape() against two local stand-in servers (one "host" per
+# ATS, so per-host limits behave as they do against the real APIs) and reports
+# throughput plus what the servers saw: retries, error statuses and which
+# boards still ended on a failure.
+
+def board_config(gh_boards: int, lever_boards: int) -> Dict[str, Any]:
+    return {"boards": {
+        "greenhouse": [{"slug": f"gh-board-{i}", "name": f"GH Company {i}"} for i in range(gh_boards)],
+        "lever": [{"slug": f"lever-board-{i}", "name": f"Lever Company {i}"} for i in range(lever_boards)],
+    }}
+
+def run(gh_boards: int, lever_boards: int, faults: Faults, workers: int, per_host: int,
+        rounds: int = 1, cache: bool = False, verbose: bool = False, **scrape_kw) -> List[Dict[str, Any]]:
+    import ats, scraper
+    from http_cache import ResponseCache
+
+    gh, lever = start(faults), start(faults)
+    saved = ats.GREENHOUSE_API, ats.LEVER_API
+    ats.GREENHOUSE_API, ats.LEVER_API = gh.url, lever.url
+    tmp = Path(tempfile.mkdtemp(prefix="bench-scrape-"))
+    cfg = board_config(gh_boards, lever_boards)
+    boards = gh_boards + lever_boards
+    reports = []
+    try:
+        response_cache = ResponseCache(tmp / "http") if cache else None
+        for n in range(1, rounds + 1):
+            before = [s.stats() for s in (gh, lever)]
+            out = io.StringIO()
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(out):
+                rows = scraper.scrape(cfg, workers=workers, per_host=per_host, cache=response_cache, **scrape_kw)
+            wall = time.perf_counter() - t0
+            if verbose:
+                print(out.getvalue(), end="")
+            after = [s.stats() for s in (gh, lever)]
+            statuses: Dict[int, int] = {}
+            for a, b in zip(after, before):
+                for code, k in a["statuses"].items():
+                    statuses[code] = statuses.get(code, 0) + k - b["statuses"].get(code, 0)
+            statuses = {code: k for code, k in sorted(statuses.items()) if k}
+            hits = [k - b["hits"].get(path, 0) for a, b in zip(after, before) for path, k in a["hits"].items()]
+            reached = sum(1 for k in hits if k)
+            failed = after[0]["failed_boards"] + after[1]["failed_boards"]
+            reports.append({
+                "round": n, "boards": boards, "rows": len(rows),
+                "wall_s": round(wall, 3), "boards_per_s": round(boards / wall, 1) if wall else None,
+                "requests": sum(statuses.values()), "retries": sum(k - 1 for k in hits if k > 1),
+                "statuses": statuses,
+                "never_sent": boards - reached,      # short-circuited by the scraper's breaker
+                "failed_boards": len(failed) + boards - reached,
+                "mib": round((sum(a["bytes"] for a in after) - sum(b["bytes"] for b in before)) / 2**20, 2),
+            })
+    finally:
+        ats.GREENHOUSE_API, ats.LEVER_API = saved
+        gh.shutdown()
+        lever.shutdown()
+    return reports
@@ -0,0 +1,98 @@
+# scripts/bench/stages.py
+from __future__ import annotations
+import os, tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Each stage is timed on its own synthetic input. "record" stages call `fn`
+# once per row (so p50/p95 per-record latency is meaningful); "batch" stages
+# call `fn` once on the whole list, as the pipeline does.
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    input: str                                  # "raw" or "normalized" rows
+    kind: str                                   # "record" or "batch"
+    setup: Callable[[], Callable[[Any], Any]]   # returns the function to time
+
+def _is_canadian():
+    from locations import is_canadian, resolve
+    resolve.cache_clear()   # cold memo each run; hits within the run are part of the workload
+    return lambda r: is_canadian(r.get("location"))
+
+def _is_internish():
+    from normalize import is_internish
+    return lambda r: is_internish(r.get("role"))
+
+def _classify():
+    from normalize import classifier
+    c = classifier()
+    c.classify.cache_clear()
+    return lambda r: c.classify(r.get("company"), r.get("role"), tuple(r.get("tags") or ()), r.get("level"))
+
+def _normalize():
+    import normalize
+    tmp = tempfile.mkdtemp(prefix="bench-normalize-")
+    # cold per-board cache: every board is reclassified
+    return lambda rows: normalize.normalize(rows, cache_path=os.path.join(tmp, "cache.json"))
+
+def _normalize_columnar():
+    import normalize
+    return normalize.normalize_columnar
+
+def _exact_dedup():
+    def run(rows):
+        seen = {}
+        for c in rows:
+            seen[(c["company"].lower(), c["role"].lower(), (c["url"] or "").lower())] = c
+        return list(seen.values())
+    return run
+
+def _near_dedup():
+    from dedup import dedup
+    return dedup
+
+def _filters() -> Dict[str, Any]:
+    from render_readme import FILTERS_YAML, load_yaml
+    return load_yaml(FILTERS_YAML)
+
+def _build_groups():
+    from render_readme import build_groups
+    filters = _filters()
+    return lambda rows: build_groups(rows, filters)
+
+def _render():
+    import render_readme
+    filters = _filters()
+    render_readme.CACHE_DIR = tempfile.mkdtemp(prefix="bench-render-")   # cold fragment cache
+
+    def run(rows):
+        groups = render_readme.build_groups(rows, filters)
+        env = render_readme.make_env()
+        sections, _, _ = render_readme.render_sections(env, groups)
+        return env.get_template(render_readme.TEMPLATE_NAME).render(
+            groups=groups, sections=sections, generated_at=datetime.now().strftime("%Y-%m-%d"))
+    return run
+
+STAGES: Dict[str, Stage] = {s.name: s for s in (
+    Stage("is_canadian", "raw", "record", _is_canadian),
+    Stage("is_internish", "raw", "record", _is_internish),
+    Stage("classify", "raw", "record", _classify),
+    Stage("normalize", "raw", "batch", _normalize),
+    Stage("normalize_columnar", "raw", "batch", _normalize_columnar),
+    Stage("exact_dedup", "normalized", "batch", _exact_dedup),
+    Stage("near_dedup", "normalized", "batch", _near_dedup),
+    Stage("build_groups", "normalized", "batch", _build_groups),
+    Stage("render", "normalized", "batch", _render),
+)}
+
+def rows_for(stage: Stage, n: int, seed: int) -> List[Dict[str, Any]]:
+    from bench.generate import normalized_postings, raw_postings
+    gen = raw_postings if stage.input == "raw" else normalized_postings
+    return list(gen(n, seed))
+
+def percentile(sorted_vals: List[float], q: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
@@ -0,0 +1,258 @@
+# scripts/benchmark.py
+from __future__ import annotations
+import argparse, contextlib, gc, io, json, multiprocessing as mp, os, platform, resource, sys, time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bench.stages import STAGES, percentile, rows_for
+
+# Offline benchmark of the pipeline's hot stages on deterministic synthetic
+# postings. No network: `scrape` benchmarks the scraper against local
+# stand-in Greenhouse/Lever servers (bench/ats_server.py). Each (stage, size) runs in a fresh process so peak RSS is
+# that run's own, and results can be compared against a saved baseline.
+
+RESULTS = Path(".cache/bench/results.json")
+DEFAULT_SIZES = "1k,10k,100k,1m"
+DEFAULT_THRESHOLD = 0.2     # 20% slower / larger than baseline counts as a regression
+
+def parse_size(s: str) -> int:
+    s = s.strip().lower().replace("_", "")
+    mult = {"k": 1_000, "m": 1_000_000}.get(s[-1:], 1)
+    return int(float(s[:-1] if mult > 1 else s) * mult)
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return None
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10   # bytes on macOS, KiB elsewhere
+
+def measure(name: str, n: int, seed: int) -> Dict[str, Any]:
+    """Run one stage on n synthetic rows in this process and return its metrics."""
+    stage = STAGES[name]
+    rows = rows_for(stage, n, seed)
+    fn = stage.setup()
+    gc.collect()
+    input_rss = _rss_mb()
+    lat: List[int] = []
+    with contextlib.redirect_stdout(io.StringIO()):   # normalize/render print progress
+        t0 = time.perf_counter()
+        c0 = time.process_time()
+        if stage.kind == "record":
+            clock = time.perf_counter_ns
+            for r in rows:
+                t = clock()
+                fn(r)
+                lat.append(clock() - t)
+        else:
+            fn(rows)
+        cpu = time.process_time() - c0
+        wall = time.perf_counter() - t0
+    lat.sort()
+    p50, p95 = percentile(lat, 0.50), percentile(lat, 0.95)
+    return {
+        "stage": name, "rows": n, "kind": stage.kind,
+        "wall_s": round(wall, 4), "cpu_s": round(cpu, 4),
+        "rows_per_s": round(n / wall, 1) if wall else None,
+        "p50_us": round(p50 / 1000, 3) if p50 is not None else None,
+        "p95_us": round(p95 / 1000, 3) if p95 is not None else None,
+        "input_rss_mb": round(input_rss, 1) if input_rss is not None else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+def _child(name: str, n: int, seed: int, q) -> None:
+    try:
+        q.put(measure(name, n, seed))
+    except BaseException as e:   # report instead of hanging the parent
+        q.put({"stage": name, "rows": n, "error": f"{type(e).__name__}: {e}"})
+
+def run_isolated(name: str, n: int, seed: int) -> Dict[str, Any]:
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=_child, args=(name, n, seed, q))
+    p.start()
+    result = q.get()
+    p.join()
+    return result
+
+def _us(v) -> str:
+    return f"{v:>8.2f}µs" if v is not None else f"{'-':>10}"
+
+def print_row(r: Dict[str, Any]) -> None:
+    if "error" in r:
+        print(f"{r['stage']:<18} {r['rows']:>9,}  ERROR {r['error']}")
+        return
+    print(f"{r['stage']:<18} {r['rows']:>9,}  {r['wall_s']:8.3f}s  {r['rows_per_s'] or 0:>12,.0f}/s  "
+          f"p50 {_us(r['p50_us'])}  p95 {_us(r['p95_us'])}  "
+          f"peak {r['peak_rss_mb']:>8.1f} MiB")
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressions against the baseline: lower throughput, higher p95 or higher peak RSS."""
+    base = {(r["stage"], r["rows"]): r for r in baseline.get("results", []) if "error" not in r}
+    regressions = []
+    for r in results:
+        b = base.get((r["stage"], r["rows"]))
+        if not b or "error" in r:
+            continue
+        checks = [
+            ("throughput", r["rows_per_s"], b["rows_per_s"], -1),
+            ("p95", r["p95_us"], b["p95_us"], 1),
+            ("peak RSS", r["peak_rss_mb"], b["peak_rss_mb"], 1),
+        ]
+        for label, now, before, sign in checks:
+            if now is None or not before:
+                continue
+            change = (now - before) / before
+            if sign * change > threshold:
+                regressions.append(f"{r['stage']}@{r['rows']:,}: {label} {before:,.2f} → {now:,.2f} ({change:+.0%})")
+    return regressions
+
+def cmd_run(args) -> int:
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    names = args.stages.split(",") if args.stages else list(STAGES)
+    unknown = [s for s in names if s not in STAGES]
+    if unknown:
+        sys.exit(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+
+    results = []
+    for n in sizes:
+        for name in names:
+            r = run_isolated(name, n, args.seed) if args.isolate else measure(name, n, args.seed)
+            print_row(r)
+            results.append(r)
+
+    doc = {
+        "meta": {"created_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "seed": args.seed, "sizes": sizes, "stages": names},
+        "results": results,
+    }
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"[bench] results → {out}")
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"[bench] baseline saved → {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.threshold)
+        for line in regressions:
+            print(f"[bench] REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"[bench] no regressions beyond {args.threshold:.0%} vs {args.baseline}")
+    return 0
+
+def cmd_generate(args) -> int:
+    from bench.generate import greenhouse_payload, lever_payload, normalized_postings, raw_postings
+    from store import write_postings
+    n = parse_size(args.size)
+    if args.kind == "greenhouse":
+        Path(args.output).write_text(json.dumps(greenhouse_payload(args.board, n, args.seed)), encoding="utf-8")
+    elif args.kind == "lever":
+        Path(args.output).write_text(json.dumps(lever_payload(args.board, n, args.seed)), encoding="utf-8")
+    else:
+        gen = raw_postings if args.kind == "raw" else normalized_postings
+        write_postings(args.output, gen(n, args.seed))
+    print(f"[bench] wrote {n:,} {args.kind} postings → {args.output}")
+    return 0
+
+def _faults(args):
+    from bench.ats_server import Faults
+    return Faults(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                  rate_429=args.rate_429, retry_after=None if args.retry_after < 0 else args.retry_after,
+                  jobs=args.jobs, huge_rate=args.huge_rate, huge_jobs=args.huge_jobs, seed=args.seed)
+
+def cmd_scrape(args) -> int:
+    from bench import scrape_load
+    from fetcher import DEFAULT_PER_HOST, DEFAULT_RETRIES, DEFAULT_WORKERS
+    from throttle import DEFAULT_RATE
+    reports = scrape_load.run(args.gh_boards, args.lever_boards, _faults(args),
+                              workers=args.workers or DEFAULT_WORKERS, per_host=args.per_host or DEFAULT_PER_HOST,
+                              rounds=args.rounds, cache=args.cache, verbose=args.verbose,
+                              rate=args.rate or DEFAULT_RATE,
+                              retries=DEFAULT_RETRIES if args.retries is None else args.retries)
+    for r in reports:
+        codes = " ".join(f"{code}×{k}" for code, k in sorted(r["statuses"].items()))
+        print(f"[bench] round {r['round']}: {r['boards']} boards in {r['wall_s']:.2f}s "
+              f"({r['boards_per_s']:.1f} boards/s), {r['rows']} rows, {r['mib']:.1f} MiB; "
+              f"{r['requests']} requests ({r['retries']} retries) [{codes}]; {r['failed_boards']} boards failed"
+              f" ({r['never_sent']} never sent)")
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps({"faults": vars(_faults(args)), "rounds": reports}, indent=2),
+                                     encoding="utf-8")
+        print(f"[bench] results → {args.output}")
+    return 0
+
+def cmd_serve(args) -> int:
+    from bench.ats_server import start
+    srv = start(_faults(args), args.host, args.port)
+    print(f"[bench] stand-in ATS API on {srv.url} (GREENHOUSE_API={srv.url} LEVER_API={srv.url}); Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(srv.stats(), indent=2))
+        srv.shutdown()
+    return 0
+
+def _add_fault_args(p) -> None:
+    p.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    p.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random delay")
+    p.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered 500/502/503")
+    p.add_argument("--rate-429", type=float, default=0.0, help="Share of requests answered 429")
+    p.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429s (negative: omit)")
+    p.add_argument("--jobs", type=int, default=40, help="Postings per board")
+    p.add_argument("--huge-rate", type=float, default=0.0, help="Share of boards with --huge-jobs postings")
+    p.add_argument("--huge-jobs", type=int, default=20_000)
+    p.add_argument("--seed", type=int, default=0)
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline benchmarks on synthetic postings")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_run = sub.add_parser("run", help="Time each stage at each size")
+    p_run.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated row counts, e.g. 1k,10k,100k,1m")
+    p_run.add_argument("--stages", help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--output", default=str(RESULTS), help="Where to write the JSON results")
+    p_run.add_argument("--baseline", help="Earlier results JSON to compare against (exit 1 on regression)")
+    p_run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="Allowed relative slowdown/growth before a regression is reported")
+    p_run.add_argument("--save-baseline", help="Also write these results as the new baseline")
+    p_run.add_argument("--no-isolate", dest="isolate", action="store_false",
+                       help="Run every stage in this process (faster, but peak RSS accumulates)")
+    p_gen = sub.add_parser("generate", help="Write a synthetic fixture")
+    p_gen.add_argument("kind", choices=["greenhouse", "lever", "raw", "normalized"])
+    p_gen.add_argument("output")
+    p_gen.add_argument("--size", default="1k")
+    p_gen.add_argument("--board", default="example", help="Board slug embedded in greenhouse/lever URLs")
+    p_gen.add_argument("--seed", type=int, default=0)
+    p_scr = sub.add_parser("scrape", help="Drive scraper.scrape() against local stand-in ATS servers")
+    p_scr.add_argument("--gh-boards", type=int, default=100)
+    p_scr.add_argument("--lever-boards", type=int, default=100)
+    p_scr.add_argument("--workers", type=int, default=None)
+    p_scr.add_argument("--per-host", type=int, default=None)
+    p_scr.add_argument("--rate", type=float, default=None, help="Scraper's max requests/second per host")
+    p_scr.add_argument("--retries", type=int, default=None, help="Scraper's retries per board")
+    p_scr.add_argument("--rounds", type=int, default=1, help="Scrape the same boards this many times")
+    p_scr.add_argument("--cache", action="store_true", help="Use the conditional-request cache across rounds")
+    p_scr.add_argument("--output", help="Write the per-round results as JSON")
+    p_scr.add_argument("--verbose", action="store_true", help="Show the scraper's own output")
+    _add_fault_args(p_scr)
+    p_srv = sub.add_parser("serve", help="Run a stand-in Greenhouse/Lever API until interrupted")
+    p_srv.add_argument("--host", default="127.0.0.1")
+    p_srv.add_argument("--port", type=int, default=8080)
+    _add_fault_args(p_srv)
+    args = ap.parse_args()
+    return {"run": cmd_run, "generate": cmd_generate, "scrape": cmd_scrape, "serve": cmd_serve}[args.cmd](args)
+
+if __name__ == "__main__":
+    sys.exit(main())
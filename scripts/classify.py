@@ -0,0 +1,134 @@
+# scripts/classify.py
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Sequence, Tuple
+
+import yaml
+
+from manifest import fingerprint
+
+FILTERS_YAML = "filters.yaml"
+
+# Tag -> (category, discipline), checked in this order; first hit wins.
+DISCIPLINES: Tuple[Tuple[str, str, str], ...] = (
+    ("electrical", "Engineering", "Electrical"),
+    ("mechanical", "Engineering", "Mechanical"),
+    ("civil", "Engineering", "Civil"),
+    ("chemical", "Engineering", "Chemical"),
+    ("mechatronics", "Engineering", "Mechatronics / Robotics"),
+    ("industrial", "Engineering", "Industrial / Manufacturing"),
+    ("aerospace", "Engineering", "Aerospace"),
+    ("mining", "Engineering", "Mining / Metallurgy"),
+    ("hardware-embedded", "Engineering", "Hardware / Embedded"),
+    ("data-ml-ai", "Engineering", "Data / ML / AI"),
+    ("software", "Engineering", "Software"),
+    ("law", "Law", "General"),
+    ("consulting", "Consulting", "General"),
+    ("business", "Business", "General"),
+)
+# free-form tags on hand-entered rows that still mean Business
+BUSINESS_HINTS = {"finance", "accounting", "product", "operations", "marketing", "strategy"}
+
+TOKEN_RE = re.compile(r"\w+|&")
+
+def tokenize(text: str | None) -> List[str]:
+    return TOKEN_RE.findall((text or "").lower().replace("’", "'"))
+
+class Classification(NamedTuple):
+    tags: Tuple[str, ...]
+    category: str
+    discipline: str
+    level: str
+
+class PhraseIndex:
+    """
+    Inverted index from token phrases ("machine learning", "pratt & whitney")
+    to labels. match() walks the tokens once, looking up every n-gram up to the
+    longest phrase, so cost depends on the text length, not the keyword count.
+    """
+
+    def __init__(self, phrases: Dict[str, Iterable[str]]):
+        self.index: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+        for phrase, labels in phrases.items():
+            key = tuple(tokenize(phrase))
+            if key:
+                self.index[key] = self.index.get(key, frozenset()) | frozenset(labels)
+        self.max_len = max((len(k) for k in self.index), default=0)
+
+    def match(self, toks: Sequence[str]) -> set:
+        out: set = set()
+        idx, n = self.index, len(toks)
+        for i in range(n):
+            for j in range(i + 1, min(i + self.max_len, n) + 1):
+                hit = idx.get(tuple(toks[i:j]))
+                if hit:
+                    out |= hit
+        return out
+
+class Classifier:
+    """
+    Compiled once from the `filters:` section of filters.yaml (categories,
+    company_hints, graduate_markers). classify() returns tags, category,
+    discipline and level in one pass and is memoized per (company, role).
+    """
+
+    def __init__(self, buckets: Dict[str, List[str]], company_hints: Dict[str, List[str]],
+                 graduate_markers: Iterable[str]):
+        keywords: Dict[str, set] = {}
+        for bucket, kws in buckets.items():
+            for kw in kws:
+                keywords.setdefault(kw, set()).add(bucket)
+        self.buckets = tuple(buckets)
+        self.keywords = PhraseIndex(keywords)
+        self.companies = PhraseIndex(company_hints)
+        self.graduate = PhraseIndex({m: ("Graduate",) for m in graduate_markers})
+        # incoming tags may be written "data ml ai", "Data-ML-AI", ...
+        self.aliases = {b.replace("-", " "): b for b in buckets}
+        self.fingerprint = fingerprint([buckets, company_hints, sorted(graduate_markers)])
+        self.classify = lru_cache(maxsize=65536)(self._classify)
+
+    @classmethod
+    def from_filters(cls, cfg: Dict[str, Any]) -> "Classifier":
+        f = cfg.get("filters") or cfg
+        return cls(f.get("categories") or {}, f.get("company_hints") or {},
+                   f.get("graduate_markers") or [])
+
+    def tags(self, company: str | None, role: str | None, incoming: Iterable[str] = ()) -> Tuple[str, ...]:
+        out = self.keywords.match(tokenize(role))
+        for t in incoming or ():
+            b = self.aliases.get((t or "").lower().replace("-", " ").strip())
+            if b:
+                out.add(b)
+        out |= self.companies.match(tokenize(company))
+        return tuple(sorted(out)) if out else ("general",)
+
+    @staticmethod
+    def category(tags: Iterable[str]) -> Tuple[str, str]:
+        tl = {t.lower() for t in tags or ()}
+        for tag, cat, disc in DISCIPLINES:
+            if tag in tl:
+                return (cat, disc)
+        if tl & BUSINESS_HINTS:
+            return ("Business", "General")
+        return ("Other", "General")
+
+    def level(self, role: str | None, tags: Iterable[str] = (), explicit: str | None = None) -> str:
+        lv = (explicit or "").lower()
+        if "under" in lv or lv == "ug":
+            return "Undergraduate"
+        if "grad" in lv or "eit" in lv or "phd" in lv or "master" in lv:
+            return "Graduate"
+        toks = tokenize(role) + [w for t in tags or () for w in tokenize(t)]
+        return "Graduate" if self.graduate.match(toks) else "Undergraduate"
+
+    def _classify(self, company: str | None, role: str | None, incoming: Tuple[str, ...] = (),
+                  explicit_level: str | None = None) -> Classification:
+        tags = self.tags(company, role, incoming)
+        category, discipline = self.category(tags)
+        return Classification(tags, category, discipline, self.level(role, tags, explicit_level))
+
+@lru_cache(maxsize=None)
+def load_classifier(path: str = FILTERS_YAML) -> Classifier:
+    with open(path, "r", encoding="utf-8") as f:
+        return Classifier.from_filters(yaml.safe_load(f) or {})
@@ -0,0 +1,121 @@
+# scripts/db.py
+from __future__ import annotations
+import argparse, json, sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from classify import Classifier
+from records import Posting, now, sightings
+from store import iter_postings, write_postings
+
+# Optional SQLite history of every posting ever seen. Rows are keyed on the
+# same case-insensitive (company, role, url) key the scraper de-dupes on, so a
+# daily batch is a single upsert transaction: new postings are inserted, known
+# ones get their fields and last_seen refreshed, and first_seen never moves.
+
+DB_PATH = Path("data/postings.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id          INTEGER PRIMARY KEY,
+    key         TEXT NOT NULL,
+    company     TEXT NOT NULL,
+    role        TEXT NOT NULL,
+    location    TEXT,
+    country     TEXT,
+    deadline    TEXT,
+    status      TEXT,
+    tags        TEXT NOT NULL DEFAULT '[]',
+    url         TEXT,
+    level       TEXT,
+    board       TEXT,
+    category    TEXT,
+    discipline  TEXT,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS postings_key ON postings(key);
+CREATE INDEX IF NOT EXISTS postings_status ON postings(status);
+CREATE INDEX IF NOT EXISTS postings_deadline ON postings(deadline);
+CREATE INDEX IF NOT EXISTS postings_category ON postings(category, discipline);
+"""
+
+UPSERT = """
+INSERT INTO postings (key, company, role, location, country, deadline, status, tags, url,
+                      level, board, category, discipline, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    company = excluded.company, role = excluded.role, location = excluded.location,
+    country = excluded.country, deadline = excluded.deadline, status = excluded.status,
+    tags = excluded.tags, url = excluded.url, level = excluded.level, board = excluded.board,
+    category = excluded.category, discipline = excluded.discipline,
+    first_seen = min(postings.first_seen, excluded.first_seen),
+    last_seen = max(postings.last_seen, excluded.last_seen)
+"""
+
+COLUMNS = ("company", "role", "location", "country", "deadline", "status", "tags", "url",
+           "level", "board", "category", "discipline", "first_seen", "last_seen")
+
+def connect(path: str | Path = DB_PATH) -> sqlite3.Connection:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _params(r: Dict[str, Any], seen_at: str) -> Tuple[Any, ...]:
+    p = Posting.from_dict({**r, "role": r.get("role") or r.get("title") or ""})
+    category, discipline = Classifier.category(p.tags)
+    # rows carry their own sighting history; today's date only fills the gaps
+    first, last = sightings(r)
+    first, last = first or seen_at, last or seen_at
+    return ("\x1f".join(p.key), p.company or "Unknown", p.role, p.location, p.country, p.deadline,
+            p.status, json.dumps(list(p.tags), ensure_ascii=False), p.url, p.level, p.board,
+            category, discipline, first, max(first, last))
+
+def upsert(conn: sqlite3.Connection, rows: Iterable[Dict[str, Any]], seen_at: str | None = None) -> Tuple[int, int]:
+    """Upsert a batch in one transaction. Returns (rows written, postings now stored)."""
+    seen_at = seen_at or now()
+    with conn:
+        cur = conn.executemany(UPSERT, (_params(r, seen_at) for r in rows))
+        written = cur.rowcount
+    total = conn.execute("SELECT count(*) FROM postings").fetchone()[0]
+    return written, total
+
+def iter_rows(conn: sqlite3.Connection, where: str = "", params: Iterable[Any] = ()) -> Iterator[Dict[str, Any]]:
+    sql = f"SELECT {', '.join(COLUMNS)} FROM postings {where} ORDER BY id"
+    for row in conn.execute(sql, tuple(params)):
+        d = dict(zip(COLUMNS, row))
+        d["tags"] = json.loads(d["tags"])
+        yield d
+
+def main():
+    ap = argparse.ArgumentParser(description="SQLite history of postings")
+    ap.add_argument("--db", default=str(DB_PATH))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_imp = sub.add_parser("import", help="Upsert postings from an NDJSON/JSON store")
+    p_imp.add_argument("src")
+    p_exp = sub.add_parser("export", help="Write stored postings to an NDJSON/JSON store")
+    p_exp.add_argument("dst")
+    p_exp.add_argument("--status", help="Only postings with this status (Open/Closed)")
+    sub.add_parser("stats", help="Counts by status and category")
+    args = ap.parse_args()
+
+    conn = connect(args.db)
+    if args.cmd == "import":
+        written, total = upsert(conn, iter_postings(args.src))
+        print(f"[db] upserted {written} postings; {total} stored in {args.db}")
+    elif args.cmd == "export":
+        where, params = ("WHERE status = ?", [args.status]) if args.status else ("", [])
+        n = write_postings(args.dst, iter_rows(conn, where, params))
+        print(f"[db] wrote {n} postings → {args.dst}")
+    else:
+        for status, n in conn.execute("SELECT status, count(*) FROM postings GROUP BY status ORDER BY status"):
+            print(f"status   {status or '-':<12} {n}")
+        for cat, n in conn.execute("SELECT category, count(*) FROM postings GROUP BY category ORDER BY 2 DESC"):
+            print(f"category {cat or '-':<12} {n}")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
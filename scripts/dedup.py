@@ -0,0 +1,227 @@
+# scripts/dedup.py
+from __future__ import annotations
+import hashlib, json
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from classify import tokenize
+from locations import resolve
+
+# Near-duplicate detection across boards. Exact (company, role, url) de-dupe
+# misses the same job listed twice with a reworded title, a tracking query
+# string, or on a second board. Each posting's company+role tokens get a
+# MinHash signature; LSH banding buckets signatures so only postings that share
+# a band are compared, and candidates are confirmed with exact Jaccard.
+#
+# Sharing a URL is weak evidence on its own: a manual page's rows without a
+# link all get the page URL, and firms list every student program on one
+# careers page. Same-URL rows from different boards merge when one's tokens
+# (nearly) contain the other's; rows from the same board are never merged on
+# URL alone, and never at all when their URLs differ, since a board lists each
+# requisition once under its own URL.
+
+DEFAULT_THRESHOLD = 0.8
+URL_CONTAINMENT = 0.9    # same canonical URL, different boards: share 90% of the smaller token set
+NUM_PERM = 64
+CHUNK = 8192
+
+TRACKING_PARAMS = {"gh_src", "gh_jid", "lever-source", "lever-origin", "source", "src", "ref",
+                   "referrer", "trk", "trackingid", "fbclid", "gclid", "mc_cid", "mc_eid"}
+
+def canonical_url(url: Any) -> str:
+    """Lower-case host, no www., no fragment, no tracking params, sorted query, no trailing slash."""
+    if not url:
+        return ""
+    parts = urlsplit(str(url).strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS)
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, parts.path.rstrip("/"), urlencode(query), ""))
+
+def token_set(r: Dict[str, Any]) -> FrozenSet[str]:
+    return frozenset(tokenize(r.get("company")) + tokenize(r.get("role") or r.get("title")))
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def containment(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Share of the smaller set found in the other one."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+def same_place(a: str | None, b: str | None) -> bool:
+    """False only when both locations are known and clearly differ (one job posted per city)."""
+    if not a or not b:
+        return True
+    ra, rb = resolve(a), resolve(b)
+    if ra.country and rb.country:
+        return (not ra.province or not rb.province or ra.province == rb.province) and \
+               (not ra.city or not rb.city or ra.city == rb.city)
+    return a.strip().lower() == b.strip().lower()
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(tok: str) -> int:
+    return int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "little")
+
+_rng = np.random.default_rng(20250812)
+_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+
+def signatures(sets: Sequence[FrozenSet[str]]) -> np.ndarray:
+    """MinHash signatures, shape (len(sets), NUM_PERM). Empty sets get all-max rows."""
+    out = np.full((len(sets), NUM_PERM), np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(sets), CHUNK):
+        chunk = [(i, s) for i, s in enumerate(sets[start:start + CHUNK], start) if s]
+        if not chunk:
+            continue
+        toks = np.fromiter((_token_hash(t) for _, s in chunk for t in s), dtype=np.uint64)
+        offsets = np.cumsum([0] + [len(s) for _, s in chunk[:-1]])
+        # multiply-shift hashing; uint64 overflow is the intended mod 2**64
+        h = (_A[:, None] * toks[None, :] + _B[:, None]) >> np.uint64(32)
+        out[[i for i, _ in chunk]] = np.minimum.reduceat(h, offsets, axis=1).T
+    return out
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """(bands, rows) whose S-curve midpoint sits a little under threshold, favouring recall."""
+    target = max(threshold - 0.1, 0.05)
+    best = min(((num_perm // r, r) for r in range(1, num_perm + 1)),
+               key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - target))
+    return best
+
+def find_clusters(rows: Sequence[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """Groups of row indices (size > 1) that are near-duplicates of each other, in input order."""
+    sets = [token_set(r) for r in rows]
+    urls = [canonical_url(r.get("url")) for r in rows]
+    boards = [r.get("board") or "" for r in rows]
+    sigs = signatures(sets)
+    bands, width = lsh_params(threshold)
+
+    parent = list(range(len(rows)))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    candidates = set()
+    for b in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        band = np.ascontiguousarray(sigs[:, b * width:(b + 1) * width])
+        for i in range(len(rows)):
+            if sets[i]:
+                buckets.setdefault(band[i].tobytes(), []).append(i)
+        for members in buckets.values():
+            for k in range(1, len(members)):
+                candidates.add((members[0], members[k]))
+                if len(members) <= 32:  # small buckets: every pair, big ones: star from the head
+                    candidates.update((members[j], members[k]) for j in range(1, k))
+    by_url: Dict[str, int] = {}
+    for i, u in enumerate(urls):
+        if u:
+            candidates.add((by_url.setdefault(u, i), i))
+
+    for i, j in candidates:
+        if i == j:
+            continue
+        same_url = bool(urls[i]) and urls[i] == urls[j]
+        same_board = bool(boards[i]) and boards[i] == boards[j]
+        if same_board and not same_url:
+            continue
+        if same_url and not same_board and containment(sets[i], sets[j]) >= URL_CONTAINMENT:
+            union(i, j)
+        elif jaccard(sets[i], sets[j]) >= threshold and same_place(rows[i].get("location"), rows[j].get("location")):
+            union(i, j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(rows)):
+        groups.setdefault(find(i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+def _brief(r: Dict[str, Any]) -> Dict[str, Any]:
+    return {"company": r.get("company"), "role": r.get("role") or r.get("title"),
+            "location": r.get("location"), "url": r.get("url")}
+
+def dedup(rows: Sequence[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Collapse near-duplicate clusters to one posting each. Like the exact
+    de-dupe, the last row of a cluster wins and keeps its position.
+    Returns (rows, report) where report lists each merged cluster.
+    """
+    rows = list(rows)
+    clusters = find_clusters(rows, threshold)
+    drop = set()
+    report = []
+    for g in clusters:
+        keep = g[-1]
+        drop.update(g[:-1])
+        kept_set = token_set(rows[keep])
+        report.append({
+            "kept": _brief(rows[keep]),
+            "merged": [{**_brief(rows[i]), "similarity": round(jaccard(token_set(rows[i]), kept_set), 3)}
+                       for i in g[:-1]],
+        })
+    return [r for i, r in enumerate(rows) if i not in drop], report
+
+
+def _synthetic(n: int, dup_rate: float = 0.1) -> List[Dict[str, Any]]:
+    import random
+    rnd = random.Random(n)
+    words = ["software", "electrical", "mechanical", "data", "civil", "hardware", "firmware", "analyst",
+             "engineering", "developer", "research", "process", "controls", "quality", "finance", "legal"]
+    terms = ["summer", "fall", "winter", "2026", "4 month", "8 month", "co-op", "intern", "internship"]
+    rows = []
+    for i in range(n):
+        if rows and rnd.random() < dup_rate:
+            src = rnd.choice(rows)
+            role = src["role"] + rnd.choice([" (Remote)", " - Toronto", "", " 2026"])
+            url = src["url"] + rnd.choice(["?utm_source=linkedin", "?gh_src=abc", "/", "#apply"])
+            rows.append({"company": src["company"], "role": role, "url": url})
+            continue
+        role = " ".join(rnd.sample(words, 2) + rnd.sample(terms, 2)).title()
+        rows.append({"company": f"Company {rnd.randrange(n // 5 + 1)}", "role": role,
+                     "url": f"https://jobs.example.com/{i}"})
+    return rows
+
+def _bench(sizes: Sequence[int], threshold: float) -> None:
+    import itertools, time
+    for n in sizes:
+        rows = _synthetic(n)
+        t0 = time.perf_counter()
+        out, report = dedup(rows, threshold)
+        secs = time.perf_counter() - t0
+        # brute force on a sample, scaled up quadratically
+        m = min(n, 1500)
+        sets = [token_set(r) for r in rows[:m]]
+        t1 = time.perf_counter()
+        for a, b in itertools.combinations(sets, 2):
+            jaccard(a, b)
+        brute = (time.perf_counter() - t1) * (n * (n - 1)) / max(m * (m - 1), 1)
+        print(f"{n:>9,} postings  LSH {secs:7.2f}s  ({len(report):,} clusters, {n - len(out):,} merged)"
+              f"   all-pairs est. {brute:9.1f}s")
+
+if __name__ == "__main__":
+    import argparse
+    from store import iter_postings
+    ap = argparse.ArgumentParser(description="Report near-duplicate postings, or benchmark the detector")
+    ap.add_argument("src", nargs="?", help="Postings store to scan")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    ap.add_argument("--bench", help="Comma-separated synthetic sizes, e.g. 10000,100000")
+    args = ap.parse_args()
+    if args.bench:
+        _bench([int(x) for x in args.bench.split(",")], args.threshold)
+    if args.src:
+        _, report = dedup(list(iter_postings(args.src)), args.threshold)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,259 @@
+# scripts/fetcher.py
+from __future__ import annotations
+import threading, time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import ResponseCache
+from throttle import (CircuitBreaker, DEFAULT_RATE, HostUnavailable, MAX_RETRY_AFTER, TokenBucket,
+                      backoff, retry_after)
+
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_RETRIES = 4
+RETRY_STATUSES = {408, 500, 502, 503, 504}
+USER_AGENT = "Canadian-Internships-Scraper/1.0 (+https://github.com/valerie-ekeigwe/Canadian-25-26-Internships)"
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+class Fetcher:
+    """
+    Shared keep-alive sessions (one per host) plus a thread pool. In-flight
+    requests are capped at `workers` in total (a semaphore held around each
+    send, so nested map() calls such as paginated boards cannot exceed it)
+    and at `per_host` per host.
+
+    Each host also gets a token bucket (at most `rate` requests/second, halved
+    on every 429 and paused for its Retry-After) and a circuit breaker. Network
+    errors and 408/5xx responses are retried up to `retries` times with
+    jittered exponential backoff; once a host has failed `breaker_threshold`
+    times in a row its requests raise HostUnavailable until `breaker_cooldown`
+    has passed, instead of waiting out timeouts board after board.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+                 cache: ResponseCache | None = None, rate: float = DEFAULT_RATE,
+                 retries: int = DEFAULT_RETRIES, breaker_threshold: int = 5, breaker_cooldown: float = 60.0):
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.cache = cache
+        self.rate = rate
+        self.retries = max(0, retries)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._sessions: Dict[str, requests.Session] = {}
+        self._gates: Dict[str, threading.BoundedSemaphore] = {}
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.stats: Dict[str, Counter] = {}   # host -> requests, retries by cause, throttled waits, ...
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def session(self, url: str) -> requests.Session:
+        host = host_of(url)
+        with self._lock:
+            s = self._sessions.get(host)
+            if s is None:
+                s = requests.Session()
+                s.headers["User-Agent"] = USER_AGENT
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                self._sessions[host] = s
+            return s
+
+    def gate(self, url: str) -> threading.BoundedSemaphore:
+        host = host_of(url)
+        with self._lock:
+            g = self._gates.get(host)
+            if g is None:
+                g = self._gates[host] = threading.BoundedSemaphore(self.per_host)
+            return g
+
+    def received(self) -> int:
+        """
+        Response bytes received by the calling thread, including requests made
+        for it inside nested map() calls; diff two readings to size one task.
+        """
+        return getattr(self._local, "bytes", 0)
+
+    def _received(self, n: int) -> None:
+        self._local.bytes = self.received() + n
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = host_of(url)
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = self._buckets[host] = TokenBucket(self.rate, burst=self.per_host)
+            return b
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = host_of(url)
+        with self._lock:
+            b = self._breakers.get(host)
+            if b is None:
+                b = self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            return b
+
+    def _count(self, host: str, what: str, n: float = 1) -> None:
+        with self._lock:
+            self.stats.setdefault(host, Counter())[what] += n
+
+    def _failed(self, host: str, breaker: CircuitBreaker) -> None:
+        if breaker.failure():
+            self._count(host, "circuit_opened")
+            print(f"[fetcher] {host}: circuit open after {breaker.failures} consecutive failures")
+
+    def get(self, url: str, **kw) -> requests.Response:
+        return self.request("GET", url, **kw)
+
+    def request(self, method: str, url: str, **kw) -> requests.Response:
+        """
+        Request with per-host pacing, retries and circuit breaking. Returns the
+        last response (which may still be a 429/5xx once retries run out);
+        raises on network errors after the final retry or HostUnavailable
+        while the host's circuit is open.
+        """
+        kw.setdefault("timeout", 20)
+        host = host_of(url)
+        bucket, breaker = self.bucket(url), self.breaker(url)
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            if not breaker.allow():
+                self._count(host, "short_circuited")
+                raise HostUnavailable(f"{host} circuit open; skipped {url}")
+            waited = bucket.acquire()
+            if waited:
+                self._count(host, "paced_s", waited)
+            self._count(host, "retries" if attempt else "requests")
+            try:
+                # host gate first, so threads queued on a busy host hold no global slot
+                with self.gate(url), self._slots:
+                    r = self.session(url).request(method, url, **kw)
+                if not kw.get("stream"):
+                    self._received(len(r.content))
+            except (requests.ConnectionError, requests.Timeout):
+                self._failed(host, breaker)
+                if last:
+                    raise
+                self._retry(host, "network", backoff(attempt))
+                continue
+            except BaseException:
+                breaker.release()   # e.g. TooManyRedirects, ChunkedEncodingError: settle the probe, then raise
+                raise
+            if r.status_code == 429:
+                breaker.release()   # host is up but throttling; the bucket handles the pacing
+                wait = retry_after(r.headers.get("Retry-After"))
+                bucket.throttled(min(wait, MAX_RETRY_AFTER) if wait is not None else None)
+                if last or (wait or 0) > MAX_RETRY_AFTER:
+                    return r
+                r.close()
+                # with a Retry-After the bucket already holds the next request back
+                self._retry(host, "429", 0.0 if wait is not None else backoff(attempt))
+                continue
+            if r.status_code in RETRY_STATUSES:
+                self._failed(host, breaker)
+                if last:
+                    return r
+                r.close()
+                wait = retry_after(r.headers.get("Retry-After"))
+                self._retry(host, "5xx" if r.status_code >= 500 else "408",
+                            min(wait, MAX_RETRY_AFTER) if wait is not None else backoff(attempt))
+                continue
+            breaker.success()
+            bucket.succeeded()
+            return r
+        raise AssertionError("unreachable")
+
+    def _retry(self, host: str, cause: str, delay: float) -> None:
+        self._count(host, f"retry_{cause}")
+        if delay > 0:
+            time.sleep(delay)
+
+    def summary(self) -> str:
+        """One line on retries, throttling and circuit breaking across all hosts ('' if none)."""
+        with self._lock:
+            total = sum(self.stats.values(), Counter())
+        causes = ", ".join(f"after {k[6:]}×{int(v)}" for k, v in sorted(total.items()) if k.startswith("retry_"))
+        parts = []
+        if total["retries"]:
+            parts.append(f"{int(total['retries'])} retries ({causes})")
+        if total["paced_s"] >= 0.01:
+            parts.append(f"{total['paced_s']:.2f}s of worker time held by rate limits")
+        if total["circuit_opened"]:
+            parts.append(f"{int(total['circuit_opened'])} circuits opened, "
+                         f"{int(total['short_circuited'])} requests short-circuited")
+        return "; ".join(parts)
+
+    def get_json(self, url: str, **kw) -> Any:
+        """GET and decode JSON, revalidating against the response cache when one is set."""
+        if self.cache is None:
+            r = self.get(url, **kw)
+            r.raise_for_status()
+            return r.json()
+        headers = dict(kw.pop("headers", None) or {})
+        headers.update(self.cache.validators(url))
+        r = self.get(url, headers=headers, **kw)
+        if r.status_code == 304:
+            payload = self.cache.load(url)
+            if payload is not None:
+                return payload
+            r = self.get(url, **kw)  # entry vanished; refetch unconditionally
+        r.raise_for_status()
+        payload = r.json()
+        self.cache.store(url, payload, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        return payload
+
+    def post_json(self, url: str, body: Any, **kw) -> Any:
+        """POST a JSON body and decode the JSON reply (search APIs; never cached)."""
+        r = self.request("POST", url, json=body, **kw)
+        r.raise_for_status()
+        return r.json()
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Tuple[Any, Optional[BaseException], float]]:
+        """
+        Run fn over items concurrently. Returns (result, error, seconds) per item,
+        in the same order as `items`, so callers see a deterministic sequence.
+        """
+        def run(item):
+            t0 = time.perf_counter()
+            try:
+                return fn(item), None, time.perf_counter() - t0
+            except Exception as e:
+                return None, e, time.perf_counter() - t0
+
+        items = list(items)
+        if self.workers == 1 or len(items) <= 1:
+            return [run(i) for i in items]
+
+        def pooled(item):
+            b0 = self.received()
+            res = run(item)
+            return res, self.received() - b0
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items))) as pool:
+            out = list(pool.map(pooled, items))
+        self._received(sum(b for _, b in out))   # credit worker-thread bytes to the caller
+        return [res for res, _ in out]
+
+    def close(self) -> None:
+        with self._lock:
+            for s in self._sessions.values():
+                s.close()
+            self._sessions.clear()
+        if self.cache is not None:
+            self.cache.save()
+
+    def __enter__(self) -> "Fetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
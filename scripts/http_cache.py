@@ -0,0 +1,123 @@
+# scripts/http_cache.py
+from __future__ import annotations
+import hashlib, json, os, pickle, threading, time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = ".cache/http"
+DEFAULT_TTL = 7 * 24 * 3600          # drop validators a week after the last 200
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class ResponseCache:
+    """
+    On-disk cache of decoded JSON responses keyed by URL.
+
+    Each entry keeps the ETag / Last-Modified validators so the next request
+    can be conditional; on a 304 the pickled payload is returned as-is, so the
+    board body is neither downloaded nor JSON-parsed again. Entries expire
+    `ttl` seconds after they were stored and the directory is held under
+    `max_bytes` by evicting the least recently used entries.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+        self._expire()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        p = self.root / self.INDEX
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _drop(self, key: str) -> None:
+        self._index.pop(key, None)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _expire(self) -> None:
+        now = time.time()
+        for k, meta in list(self._index.items()):
+            if now - meta.get("stored_at", 0) > self.ttl or not self._path(k).exists():
+                self._drop(k)
+
+    def _evict(self) -> None:
+        total = sum(m.get("size", 0) for m in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for k, meta in sorted(self._index.items(), key=lambda kv: kv[1].get("used_at", 0)):
+            if total <= self.max_bytes:
+                break
+            total -= meta.get("size", 0)
+            self._drop(k)
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for url, or {} when nothing is cached."""
+        with self._lock:
+            meta = self._index.get(self.key(url))
+        if not meta:
+            return {}
+        h = {}
+        if meta.get("etag"):
+            h["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            h["If-Modified-Since"] = meta["last_modified"]
+        return h
+
+    def load(self, url: str) -> Optional[Any]:
+        """Cached payload for url (after a 304), or None if the entry is gone."""
+        k = self.key(url)
+        try:
+            with open(self._path(k), "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            with self._lock:
+                self._drop(k)
+            return None
+        with self._lock:
+            if k in self._index:
+                self._index[k]["used_at"] = time.time()
+            self.hits += 1
+        return payload
+
+    def store(self, url: str, payload: Any, etag: str | None, last_modified: str | None) -> None:
+        with self._lock:
+            self.misses += 1
+        if not etag and not last_modified:
+            return  # nothing to revalidate with
+        k = self.key(url)
+        blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp = self._path(k).with_suffix(f".tmp{threading.get_ident()}")
+        tmp.write_bytes(blob)
+        os.replace(tmp, self._path(k))
+        now = time.time()
+        with self._lock:
+            self._index[k] = {"url": url, "etag": etag, "last_modified": last_modified,
+                              "stored_at": now, "used_at": now, "size": len(blob)}
+            self._evict()
+
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps(self._index, indent=2)
+        tmp = self.root / (self.INDEX + ".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.root / self.INDEX)
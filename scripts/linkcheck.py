@@ -0,0 +1,166 @@
+# scripts/linkcheck.py
+from __future__ import annotations
+import argparse, json, re, sys, time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+from urllib.parse import urlsplit
+
+import requests
+
+from fetcher import Fetcher, DEFAULT_PER_HOST, host_of
+from metrics import METRICS
+from normalize import norm_status
+from store import POSTINGS, Postings, write_postings
+from throttle import DEFAULT_RATE
+
+# Checks that posting URLs still resolve and closes the postings whose page is
+# gone. Each distinct URL gets a HEAD (redirects followed), and a streamed GET
+# whose body is never read if HEAD is refused or errors, since plenty of servers
+# answer HEAD with 403/404/405. Verdicts:
+#   ok     the page (or where it redirects) answers 2xx/3xx
+#   dead   404 or 410
+#   moved  redirected to a "generic" page on the same site: its root or an
+#          ancestor of the original path ("/careers/job/123" -> "/careers"),
+#          or an ATS "?error=true" board page, which is how closed jobs usually
+#          redirect. A URL that is already a root or locale page never "moves".
+#   error  anything else (403, 429, 5xx, timeouts, open circuit): not cached,
+#          and the posting is left alone rather than closed on our own bad luck
+# dead/moved postings are marked Closed. Non-error verdicts are cached for
+# `ttl` seconds, so each URL is rechecked at most once per interval.
+
+CACHE = Path(".cache/links.json")
+DEFAULT_TTL = 24 * 3600
+DEFAULT_WORKERS = 64
+TIMEOUT = 10
+DEAD_STATUSES = {404, 410}
+LOCALE_RE = re.compile(r"^[a-z]{2}(?:[-_][a-z]{2})?$", re.I)
+
+def _segments(path: str) -> List[str]:
+    segs = [s for s in path.lower().split("/") if s]
+    return segs[1:] if segs and LOCALE_RE.match(segs[0]) else segs
+
+def _host(netloc: str) -> str:
+    host = netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+def is_generic_redirect(url: str, final: str | None) -> bool:
+    """
+    True when `final` is the site root, an ancestor of `url`'s path, or an
+    error board page. A `url` that is itself a root or locale-only path can't
+    have moved to a generic page, and scheme and "www." changes don't count.
+    """
+    if not final:
+        return False
+    a, b = urlsplit(url), urlsplit(final)
+    if (_host(a.netloc), a.path.rstrip("/"), a.query) == (_host(b.netloc), b.path.rstrip("/"), b.query):
+        return False
+    if re.search(r"(?:^|&)error=true(?:&|$)", b.query):
+        return True
+    src, dst = _segments(a.path), _segments(b.path)
+    if not src:
+        return False
+    return _host(b.netloc) == _host(a.netloc) and len(dst) < len(src) and src[:len(dst)] == dst
+
+def verdict(url: str, status: int, final: str | None) -> str:
+    if status in DEAD_STATUSES:
+        return "dead"
+    if status >= 400:
+        return "error"
+    return "moved" if is_generic_redirect(url, final) else "ok"
+
+def check(url: str, fetcher: Fetcher) -> Dict[str, Any]:
+    """HEAD, falling back to a streamed GET; returns {"verdict", "status", "final"}."""
+    r = None
+    try:
+        r = fetcher.request("HEAD", url, allow_redirects=True, timeout=TIMEOUT)
+    except requests.RequestException:
+        pass   # some servers reset or time out on HEAD; GET decides (an open circuit still raises)
+    if r is None or r.status_code >= 400:
+        r = fetcher.request("GET", url, allow_redirects=True, timeout=TIMEOUT, stream=True)
+        r.close()   # headers are enough; never download the page
+    return {"verdict": verdict(url, r.status_code, r.url), "status": r.status_code, "final": r.url}
+
+def interleave(urls: Iterable[str]) -> List[str]:
+    """
+    Round-robin the URLs by host. Rows arrive grouped by board, and a pool fed
+    one host's URLs back to back would park every worker on that host's
+    per-host gate and rate limit while the other hosts sit idle.
+    """
+    by_host: Dict[str, List[str]] = {}
+    for u in urls:
+        by_host.setdefault(host_of(u), []).append(u)
+    queues = list(by_host.values())
+    return [q[i] for i in range(max(map(len, queues), default=0)) for q in queues if i < len(q)]
+
+def _load(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def check_links(rows: Iterable[Dict[str, Any]], fetcher: Fetcher, cache_path: str | Path = CACHE,
+                ttl: float = DEFAULT_TTL) -> List[Dict[str, Any]]:
+    """
+    Check every distinct URL of the open postings (reusing cached verdicts
+    younger than `ttl`) and return the rows with dead/moved postings Closed.
+    """
+    rows = list(rows)
+    cache_path = Path(cache_path)
+    now = time.time()
+    cache = {u: e for u, e in _load(cache_path).items() if now - e.get("checked_at", 0) <= ttl}
+    urls = list(dict.fromkeys(r["url"] for r in rows if r.get("url") and norm_status(r.get("status")) == "Open"))
+    todo = interleave(u for u in urls if u not in cache)
+
+    t0 = time.perf_counter()
+    results = fetcher.map(lambda u: check(u, fetcher), todo)
+    verdicts = Counter()
+    for url, (res, err, _) in zip(todo, results):
+        if err is not None:
+            res = {"verdict": "error", "status": None, "final": None, "error": f"{type(err).__name__}: {err}"}
+        verdicts[res["verdict"]] += 1
+        if res["verdict"] != "error":
+            cache[url] = {**res, "checked_at": now}
+    wall = time.perf_counter() - t0
+
+    out, closed = [], Counter()
+    for r in rows:
+        v = (cache.get(r.get("url")) or {}).get("verdict") if r.get("url") else None
+        if v in ("dead", "moved") and norm_status(r.get("status")) == "Open":
+            r = {**r, "status": "Closed"}
+            closed[v] += 1
+        out.append(r)
+
+    live = set(urls)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps({u: e for u, e in cache.items() if u in live}, ensure_ascii=False),
+                          encoding="utf-8")
+    for v, n in verdicts.items():
+        METRICS.count("links_checked", n, verdict=v)
+    for v, n in closed.items():
+        METRICS.count("closed", n, stage="links", reason=v)
+    METRICS.set("links_cached", len(urls) - len(todo), stage="links")
+    summary = ", ".join(f"{v} {n}" for v, n in sorted(verdicts.items())) or "nothing due"
+    print(f"[links] checked {len(todo)} of {len(urls)} URLs in {wall:.2f}s "
+          f"({len(urls) - len(todo)} cached; {summary}); closed {sum(closed.values())} postings")
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Close postings whose URL is dead or redirects to a generic page")
+    ap.add_argument("--postings", default=str(POSTINGS))
+    ap.add_argument("--cache", default=str(CACHE), help="Per-URL verdicts")
+    ap.add_argument("--ttl", type=float, default=DEFAULT_TTL / 3600, help="Hours before a URL is rechecked")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Max concurrent checks")
+    ap.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="Max concurrent checks per host")
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Max requests/second per host")
+    args = ap.parse_args()
+    if not Path(args.postings).exists():
+        sys.exit(f"{args.postings} is missing")
+    with Fetcher(workers=args.workers, per_host=args.per_host, rate=args.rate, retries=1) as fetcher:
+        rows = check_links(Postings(args.postings), fetcher, args.cache, args.ttl * 3600)
+    n = write_postings(args.postings, rows)
+    print(f"[links] wrote {n} postings → {args.postings}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# scripts/locations.py
+from __future__ import annotations
+import re, unicodedata
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+class Location(NamedTuple):
+    city: Optional[str]
+    province: Optional[str]   # two-letter code, e.g. "ON"
+    country: Optional[str]
+
+NOWHERE = Location(None, None, None)
+
+PROVINCES = {
+    "ontario": "ON", "quebec": "QC", "british columbia": "BC", "alberta": "AB",
+    "manitoba": "MB", "saskatchewan": "SK", "nova scotia": "NS", "new brunswick": "NB",
+    "prince edward island": "PE", "pei": "PE", "newfoundland": "NL", "labrador": "NL",
+    "yukon": "YT", "northwest territories": "NT", "nunavut": "NU",
+}
+CODES = {"ON", "QC", "BC", "AB", "MB", "SK", "NS", "NB", "PE", "NL", "YT", "NT", "NU"}
+
+# Only cities that are unambiguous on their own (no London, Kingston, Victoria...)
+CITIES = {
+    "toronto": "ON", "ottawa": "ON", "waterloo": "ON", "kitchener": "ON", "mississauga": "ON",
+    "brampton": "ON", "markham": "ON", "oakville": "ON", "guelph": "ON", "montreal": "QC",
+    "quebec city": "QC", "gatineau": "QC", "laval": "QC", "sherbrooke": "QC", "vancouver": "BC",
+    "burnaby": "BC", "calgary": "AB", "edmonton": "AB", "winnipeg": "MB", "regina": "SK",
+    "saskatoon": "SK", "halifax": "NS", "fredericton": "NB", "moncton": "NB",
+    "charlottetown": "PE", "st. john's": "NL", "st john's": "NL", "st johns": "NL",
+    "whitehorse": "YT", "yellowknife": "NT", "iqaluit": "NU",
+}
+
+def _alt(words) -> str:
+    # longest first so "quebec city" wins over "quebec"; ties alphabetical, since set
+    # order varies between processes and the pattern text versions the normalize cache
+    return "|".join(re.escape(w) for w in sorted(words, key=lambda w: (-len(w), w)))
+
+# One pass over the string: a named place anywhere (word-bounded), or a bare
+# province code only where a region code goes ("Ottawa, ON", "ON, Canada",
+# "Toronto, ON M5V"), so "on"/"ab" inside London or Boston never match.
+LOCATION_RE = re.compile(
+    rf"\b(?P<country>canada)\b"
+    rf"|\b(?P<city>{_alt(CITIES)})(?![\w'])"
+    rf"|\b(?P<province>{_alt(PROVINCES)})\b"
+    rf"|(?:^|[,/(|;-])\s*(?P<code>{_alt(c.lower() for c in CODES)})"
+    rf"(?=\s*(?:$|[,/)|;]|-|\s[a-z]\d[a-z]|\scanada\b))"
+)
+
+def _fold(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s.lower().replace("’", "'"))
+    return "".join(ch for ch in s if not unicodedata.combining(ch)).strip()
+
+@lru_cache(maxsize=4096)
+def resolve(loc: str | None) -> Location:
+    """
+    Resolve a free-form ATS location string to (city, province, country).
+    Non-Canadian or empty strings resolve to (None, None, None).
+    """
+    if not loc:
+        return NOWHERE
+    city = province = None
+    canada = False
+    for m in LOCATION_RE.finditer(_fold(loc)):
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == "country":
+            canada = True
+        elif kind == "city" and city is None:
+            city = " ".join(w.capitalize() for w in text.split())
+            province = province or CITIES[text]
+        elif kind == "province":
+            province = PROVINCES[text]
+        elif kind == "code":
+            province = text.upper()
+    if not (canada or city or province):
+        return NOWHERE
+    return Location(city, province, "Canada")
+
+def is_canadian(loc: str | None) -> bool:
+    return resolve(loc).country == "Canada"
+
+
+def _bench(n: int) -> None:
+    import random, time
+    # the substring scan scraper.looks_canadian / normalize.is_canadian used to do
+    legacy_hints = [
+        " canada "," toronto "," ontario "," on "," ottawa "," waterloo "," montreal ",
+        " québec "," quebec "," qc "," vancouver "," british columbia "," bc ",
+        " calgary "," edmonton "," alberta "," ab "," manitoba "," mb "," winnipeg ",
+        " saskatchewan "," sk "," regina "," saskatoon "," nova scotia "," ns "," halifax ",
+        " new brunswick "," nb "," pei "," prince edward island "," newfoundland "," nl ",
+        " st. john’s "," st johns "," yukon "," whitehorse "," northwest territories "," nt ",
+        " nunavut "," nu ",
+    ]
+    def legacy(loc):
+        if not loc:
+            return False
+        t = f" {loc.lower()} "
+        return any(h in t for h in legacy_hints)
+
+    rnd = random.Random(7)
+    places = ["Toronto, ON", "Vancouver, BC", "Montréal, QC", "Remote - Canada", "Ottawa, ON K1A 0B1",
+              "Calgary, Alberta", "Halifax, NS", "San Francisco, CA", "New York, NY", "London, UK",
+              "Boston, MA", "Remote", "Austin, TX", "Waterloo, Ontario, Canada", "Berlin, Germany"]
+    pool = [f"{rnd.choice(places)}{'' if i % 3 else ' (Hybrid)'}{' #' + str(i) if i % 2 else ''}" for i in range(300)]
+    sample = [rnd.choice(pool) for _ in range(n)]
+
+    def timeit(fn):
+        t0 = time.perf_counter()
+        for s in sample:
+            fn(s)
+        return time.perf_counter() - t0
+
+    resolve.cache_clear()
+    rows = [("legacy substring scan", timeit(legacy)),
+            ("compiled regex, cold memo", timeit(resolve)),
+            ("compiled regex, warm memo", timeit(resolve))]
+    for name, secs in rows:
+        print(f"{name:28s} {n / secs:>12,.0f} locations/s")
+    resolve.cache_clear()
+    fn = resolve.__wrapped__
+    print(f"{'compiled regex, no memo':28s} {n / timeit(fn):>12,.0f} locations/s")
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Resolve locations or benchmark the matcher")
+    ap.add_argument("locations", nargs="*")
+    ap.add_argument("--bench", type=int, metavar="N", help="Time N lookups against the legacy substring scan")
+    args = ap.parse_args()
+    if args.bench:
+        _bench(args.bench)
+    for loc in args.locations:
+        print(f"{loc!r}: {resolve(loc)}")
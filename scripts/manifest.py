@@ -0,0 +1,30 @@
+# scripts/manifest.py
+from __future__ import annotations
+import hashlib, json
+from pathlib import Path
+from typing import Any, Dict
+
+# data/manifest.json holds the last render fingerprint (render_readme.py), so an
+# unchanged run leaves README.md alone. Per-board change detection lives in
+# normalize's own cache (.cache/normalize.json), next to the rows it reuses.
+MANIFEST = Path("data/manifest.json")
+
+def fingerprint(obj: Any) -> str:
+    """Stable content hash of any JSON-serializable value."""
+    blob = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+def board_key(r: Dict[str, Any]) -> str:
+    # scraped rows carry "greenhouse:<slug>" etc.; hand-entered rows only have a source
+    return r.get("board") or (r.get("source") or "unknown").lower()
+
+def load_manifest(path: str | Path = MANIFEST) -> Dict[str, Any]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(m: Dict[str, Any], path: str | Path = MANIFEST) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(m, indent=2, sort_keys=True), encoding="utf-8")
@@ -0,0 +1,185 @@
+# scripts/manual.py
+from __future__ import annotations
+import argparse, hashlib, json, re, sys, time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from lxml import etree, html
+
+from fetcher import Fetcher
+from locations import is_canadian
+from manifest import fingerprint
+from metrics import METRICS
+from normalize import INTERN_RE
+from records import Posting
+
+# Scrapes the `manual:` career pages in filters.yaml. Each entry names a
+# company and page URL, plus optional XPath selectors (relative ones are
+# evaluated against each matched item):
+#   item:     elements that are one posting each     (default: every link outside nav/header/footer)
+#   title:    the posting title                       (default: the item's text)
+#   link:     the posting URL, resolved against the page   (default: @href)
+#   location: the posting location                    (default: the entry's `location`)
+# Links back to the page itself or to one of its parent paths (breadcrumbs,
+# section nav) are never postings, whatever the selectors. Pages are fetched
+# concurrently; a page whose body hashes the same as last run (and whose
+# selectors are unchanged) reuses its cached postings unparsed.
+
+CACHE = Path(".cache/manual.json")
+DEFAULTS = {"item": "//a[@href][not(ancestor::nav or ancestor::header or ancestor::footer)]",
+            "title": "normalize-space(.)", "link": "@href", "location": None}
+
+@lru_cache(maxsize=None)
+def xpath(expr: str) -> etree.XPath:
+    """Compile each selector once per process, however many pages use it."""
+    return etree.XPath(expr, smart_strings=False)
+
+@dataclass(frozen=True)
+class Source:
+    company: str
+    url: str
+    item: str = DEFAULTS["item"]
+    title: str = DEFAULTS["title"]
+    link: str = DEFAULTS["link"]
+    location_xpath: Optional[str] = None
+    location: Optional[str] = None
+
+    @classmethod
+    def from_entry(cls, e: Dict[str, Any]) -> "Source":
+        sel = e.get("selectors") or {}
+        return cls(company=e["company"], url=e["url"],
+                   item=sel.get("item") or DEFAULTS["item"], title=sel.get("title") or DEFAULTS["title"],
+                   link=sel.get("link") or DEFAULTS["link"], location_xpath=sel.get("location"),
+                   location=e.get("location"))
+
+    @property
+    def board(self) -> str:
+        return sys.intern("manual:" + re.sub(r"[^a-z0-9]+", "-", self.company.lower()).strip("-"))
+
+    @property
+    def rules(self) -> str:
+        return fingerprint([self.item, self.title, self.link, self.location_xpath, self.location, INTERN_RE.pattern])
+
+def _first(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if value is None:
+        return None
+    if not isinstance(value, str):   # element: take its text
+        value = value.text_content() if hasattr(value, "text_content") else str(value)
+    return " ".join(value.split()) or None
+
+def _host(netloc: str) -> str:
+    host = netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+def page_link(page: str, url: str) -> bool:
+    """True for a link to `page` itself, one of its parent paths, or a non-web scheme."""
+    a, b = urlsplit(page), urlsplit(url)
+    if b.scheme not in ("http", "https"):
+        return True
+    if _host(a.netloc) != _host(b.netloc) or (b.query and b.query != a.query):
+        return False   # elsewhere, or e.g. careers.aspx?job=123 on the page's own path
+    src, dst = [s for s in a.path.split("/") if s], [s for s in b.path.split("/") if s]
+    return len(dst) <= len(src) and src[:len(dst)] == dst
+
+def parse(src: Source, body: bytes) -> List[Posting]:
+    """Postings (gh_to_posting schema) for the intern/co-op items on one page."""
+    doc = html.fromstring(body, base_url=src.url)
+    title_x, link_x = xpath(src.title), xpath(src.link)
+    loc_x = xpath(src.location_xpath) if src.location_xpath else None
+    out: List[Posting] = []
+    seen = set()
+    for node in xpath(src.item)(doc):
+        title = _first(title_x(node))
+        if not title or not INTERN_RE.search(title):
+            continue
+        href = _first(link_x(node))
+        url = urljoin(src.url, href) if href else src.url
+        if href and page_link(src.url, url):
+            continue
+        loc = (_first(loc_x(node)) if loc_x is not None else None) or src.location
+        if (title, url) in seen:
+            continue
+        seen.add((title, url))
+        out.append(Posting(company=src.company, role=title, location=loc,
+                           country="Canada" if is_canadian(loc) else None, url=url, board=src.board))
+    return out
+
+def sources(cfg: Dict[str, Any]) -> List[Source]:
+    return [Source.from_entry(e) for e in cfg.get("manual") or [] if e.get("company") and e.get("url")]
+
+def scrape_manual(cfg: Dict[str, Any], fetcher: Fetcher, cache_path: str | Path = CACHE) -> Tuple[List[Posting], List[str]]:
+    """
+    Fetch every manual source concurrently and parse the pages that changed.
+    Returns (postings, boards that failed to fetch).
+    """
+    srcs = sources(cfg)
+    if not srcs:
+        return [], []
+    cache_path = Path(cache_path)
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+
+    def fetch(src: Source) -> bytes:
+        r = fetcher.get(src.url)
+        r.raise_for_status()
+        return r.content
+
+    t0 = time.perf_counter()
+    results = fetcher.map(fetch, srcs)
+    postings: List[Posting] = []
+    failed, fresh = [], {}
+    reused = parsed = 0
+    for src, (body, err, secs) in zip(srcs, results):
+        if err is not None:
+            print(f"[warn] manual fetch failed for {src.company}: {err}")
+            METRICS.board(src.board, ok=0, latency_s=round(secs, 4), error=f"{type(err).__name__}: {err}")
+            failed.append(src.board)
+            if src.url in cache:
+                fresh[src.url] = cache[src.url]   # keep its hash for when the page is back
+            continue
+        digest = hashlib.sha1(body).hexdigest()
+        prev = cache.get(src.url) or {}
+        if prev.get("hash") == digest and prev.get("rules") == src.rules:
+            rows = [Posting.from_dict(r) for r in prev.get("rows") or []]
+            reused += 1
+        else:
+            try:
+                rows = parse(src, body)
+            except (etree.ParserError, etree.XPathError, ValueError) as e:
+                print(f"[warn] manual parse failed for {src.company}: {e}")
+                failed.append(src.board)
+                continue
+            parsed += 1
+        fresh[src.url] = {"hash": digest, "rules": src.rules, "rows": [p.to_dict() for p in rows]}
+        ok = [p for p in rows if p.country == "Canada"]
+        postings.extend(ok)
+        METRICS.board(src.board, ok=1, latency_s=round(secs, 4), bytes=len(body), jobs=len(rows), kept=len(ok),
+                      rejected_canadian=len(rows) - len(ok), unchanged=prev.get("hash") == digest)
+        METRICS.count("rejected", len(rows) - len(ok), stage="scrape", reason="canadian")
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(fresh, ensure_ascii=False), encoding="utf-8")
+    print(f"[manual] {len(srcs)} pages in {time.perf_counter() - t0:.2f}s: {parsed} parsed, "
+          f"{reused} unchanged, {len(failed)} failed; {len(postings)} postings")
+    return postings, failed
+
+def main():
+    from scraper import load_yaml
+    ap = argparse.ArgumentParser(description="Scrape the manual: career pages in filters.yaml")
+    ap.add_argument("--filters", default="filters.yaml")
+    ap.add_argument("--cache", default=str(CACHE), help="Per-page content hashes and parsed postings")
+    args = ap.parse_args()
+    with Fetcher() as fetcher:
+        postings, _ = scrape_manual(load_yaml(args.filters), fetcher, args.cache)
+    for p in postings:
+        print(p.to_json())
+
+if __name__ == "__main__":
+    main()
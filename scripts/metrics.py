@@ -0,0 +1,129 @@
+# scripts/metrics.py
+from __future__ import annotations
+import json, os, threading, time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+# Process-wide run metrics. scraper/normalize/render record into METRICS as
+# they go (per-board fetch stats, rejection counts, row counts); pipeline.py
+# wraps each stage in METRICS.stage() and exports the lot as a JSON run report
+# and/or a Prometheus textfile (for node_exporter's textfile collector).
+
+PREFIX = "internships"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            self.gauges: Dict[Tuple[str, Labels], float] = {}
+            self.boards: Dict[str, Dict[str, Any]] = {}
+            self.stages: Dict[str, Dict[str, float]] = {}
+
+    def count(self, name: str, n: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def board(self, key: str, **fields: Any) -> None:
+        """Merge per-board fetch stats (latency_s, bytes, jobs, kept, rejected_*, ok)."""
+        with self._lock:
+            self.boards.setdefault(key, {}).update(fields)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = {"wall_s": round(time.perf_counter() - t0, 4),
+                                     "cpu_s": round(time.process_time() - c0, 4)}
+
+    def report(self) -> Dict[str, Any]:
+        def flat(d):
+            return [{"name": n, **dict(l), "value": v} for (n, l), v in sorted(d.items())]
+        with self._lock:
+            return {
+                "started_at": datetime.fromtimestamp(self.started, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+                "duration_s": round(time.time() - self.started, 3),
+                "stages": dict(self.stages),
+                "counters": flat(self.counters),
+                "gauges": flat(self.gauges),
+                "boards": dict(sorted(self.boards.items())),
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        def family(name: str, kind: str, help_: str, samples) -> None:
+            samples = list(samples)
+            if not samples:
+                return
+            lines.append(f"# HELP {PREFIX}_{name} {help_}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                lab = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{PREFIX}_{name}{{{lab}}} {_num(value)}" if lab else f"{PREFIX}_{name} {_num(value)}")
+
+        with self._lock:
+            stages = dict(self.stages)
+            boards = dict(self.boards)
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        family("last_run_timestamp_seconds", "gauge", "Unix time the run finished", [((), round(time.time(), 3))])
+        family("stage_wall_seconds", "gauge", "Wall time per pipeline stage",
+               [((("stage", s),), v["wall_s"]) for s, v in stages.items()])
+        family("stage_cpu_seconds", "gauge", "CPU time per pipeline stage",
+               [((("stage", s),), v["cpu_s"]) for s, v in stages.items()])
+        for field, help_ in (("latency_s", "Board fetch wall time including pagination and retries"),
+                             ("bytes", "Response bytes received for the board"),
+                             ("jobs", "Jobs listed on the board"),
+                             ("kept", "Canadian intern/co-op postings kept from the board"),
+                             ("ok", "1 if the board was fetched, 0 if it was skipped")):
+            name = {"latency_s": "board_fetch_seconds", "bytes": "board_bytes", "jobs": "board_jobs",
+                    "kept": "board_postings", "ok": "board_up"}[field]
+            family(name, "gauge", help_,
+                   [((("board", b),), f[field]) for b, f in sorted(boards.items()) if field in f])
+        for name in sorted({n for n, _ in counters}):
+            family(f"{name}_total", "counter", name.replace("_", " ").capitalize(),
+                   [(l, v) for (n, l), v in sorted(counters.items()) if n == name])
+        for name in sorted({n for n, _ in gauges}):
+            family(name, "gauge", name.replace("_", " ").capitalize(),
+                   [(l, v) for (n, l), v in sorted(gauges.items()) if n == name])
+        return "\n".join(lines) + "\n"
+
+def _num(v: Any) -> str:
+    v = float(v)
+    return str(int(v)) if v.is_integer() else repr(v)
+
+def _escape(v: Any) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _atomic_write(path: str | Path, text: str) -> None:
+    # textfile collectors may read mid-write, so swap the file in whole
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+METRICS = Metrics()
+
+def write_report(path: str | Path, metrics: Metrics = METRICS) -> None:
+    _atomic_write(path, json.dumps(metrics.report(), indent=2, ensure_ascii=False))
+
+def write_textfile(path: str | Path, metrics: Metrics = METRICS) -> None:
+    _atomic_write(path, metrics.prometheus())
@@ -1,169 +1,255 @@
 # scripts/normalize.py
+from __future__ import annotations
 import json, re, sys
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
 
-INPUT = Path("data/postings.json")
-OUTPUT = Path("data/postings.json")
-
-if not INPUT.exists():
-    sys.exit("data/postings.json is missing")
-
-raw = json.loads(INPUT.read_text(encoding="utf-8"))
-arr = raw if isinstance(raw, list) else list(raw.get("items", {}).values())
-
-# Canada matcher
-CAN_HINTS = [
-  " canada "," toronto "," ontario "," on "," ottawa "," waterloo "," montreal ",
-  " québec "," quebec "," qc "," vancouver "," british columbia "," bc ",
-  " calgary "," edmonton "," alberta "," ab "," manitoba "," mb "," winnipeg ",
-  " saskatchewan "," sk "," regina "," saskatoon ",
-  " nova scotia "," ns "," halifax "," new brunswick "," nb ",
-  " pei "," prince edward island "," newfoundland "," nl ",
-  " st. john’s "," st johns "," yukon "," whitehorse "," northwest territories "," nt ",
-  " nunavut "," nu "
-]
-def is_canadian(loc: str|None) -> bool:
-    if not loc: return False
-    t = f" {loc.lower()} "
-    return (" canada " in t) or any(h in t for h in CAN_HINTS)
+from classify import load_classifier
+from locations import LOCATION_RE, is_canadian
+from manifest import board_key, fingerprint
+from metrics import METRICS
+from records import content, sightings
+from store import POSTINGS, Postings, write_postings
+
+INPUT = POSTINGS
+OUTPUT = POSTINGS
+CACHE = Path(".cache/normalize.json")
+FILTERS = Path("filters.yaml")
+
+# Canada matcher lives in locations.py (shared with scraper and render)
 
 # STRICT intern/co-op regex (avoids "International")
 INTERN_RE = re.compile(r"\b(intern(ship)?|co[- ]?op|coop|student|summer|placement)\b", re.I)
 def is_internish(role: str|None) -> bool:
     return bool(INTERN_RE.search(role or ""))
 
+CLOSED = {"closed","filled","no longer available","not accepting applications"}
 def norm_status(s):
     if not s: return "Open"
     s = s.strip().lower()
-    return "Closed" if s in {"closed","filled","no longer available","not accepting applications"} else "Open"
-
-def infer_level(role, tags):
-    blob = f"{(role or '').lower()} {' '.join(tags or [])}"
-    if any(k in blob for k in ["eit","graduate","masters","master’s","phd","new grad program","articling"]):
-        return "Graduate"
-    if any(k in blob for k in ["intern","co-op","co op","coop","undergrad","bachelor","summer","student","law student"]):
-        return "Undergraduate"
-    return "Undergraduate"
-
-# Tag buckets (matches your filters.yaml buckets)
-BUCKETS = {
-  "software": ["software","swe","developer","full stack","frontend","backend","mobile","android","ios","web"],
-  "mechatronics": ["mechatronics","robotics","autonomy","controls","automation"],
-  "electrical": ["electrical","electronics","power systems","pcb","circuit","firmware","substation","distribution"],
-  "mechanical": ["mechanical","thermodynamics","hvac","cad","solidworks","catia","ansys","fea","manufacturing engineer"],
-  "civil": ["civil","structural","municipal","transportation","geotech","construction"],
-  "chemical": ["chemical","process","petroleum","refining","materials"],
-  "industrial": ["industrial","manufacturing","lean","six sigma","operations","quality","supply chain","process engineer"],
-  "aerospace": ["aerospace","avionics","space","propulsion","aerodynamics","satellite","uav"],
-  "mining": ["mining","metallurgy","mine","geology","geoscience"],
-  "data-ml-ai": ["data","ml","machine learning","ai","analytics","business intelligence","science"],
-  "hardware-embedded": ["embedded","fpga","asic","verilog","vhdl","rtl","hardware","micros","risc","arm"],
-  "law": ["legal","law","paralegal","policy","compliance","regulatory","litigation","clerk","law student"],
-  "consulting": ["consultant","consulting","strategy","advisory","analytics","transformation","risk","deal","operations"],
-  "business": ["business","finance","marketing","accounting","economics","management","sales","hr","operations"],
-}
-
-# Company hints to auto-tag generic titles
-COMPANY_HINTS = {
-  # Auto OEMs
-  "ford": ["mechanical","electrical","industrial"],
-  "toyota": ["mechanical","electrical","industrial"],
-  "honda": ["mechanical","electrical","industrial"],
-  "stellantis": ["mechanical","electrical","industrial"],
-  "gm": ["mechanical","electrical","industrial"],
-  "general motors": ["mechanical","electrical","industrial"],
-
-  # Power & Utilities (Electrical-heavy)
-  "hydro one": ["electrical"],
-  "ontario power generation": ["electrical","mechanical","chemical"],
-  "opg": ["electrical","mechanical","chemical"],
-  "bruce power": ["electrical","mechanical","chemical"],
-  "bc hydro": ["electrical"],
-  "hydro-qu\u00E9bec": ["electrical"],
-
-  # Energy / Pipelines / Oil & Gas (Chemical/Mechanical/Civil/Industrial)
-  "enbridge": ["chemical","mechanical","civil","industrial"],
-  "tc energy": ["civil","mechanical","industrial"],
-  "suncor": ["chemical","mechanical","industrial"],
-  "cenovus": ["chemical","mechanical","industrial"],
-  "imperial": ["chemical","mechanical","industrial"],
-  "pembina": ["chemical","mechanical","industrial"],
-  "transalta": ["electrical","mechanical","industrial"],
-
-  # Engineering consultancies (Civil/Mech/Chem/Electrical)
-  "wsp": ["civil","mechanical","electrical","chemical"],
-  "stantec": ["civil","mechanical","electrical","chemical"],
-  "hatch": ["civil","mechanical","electrical","chemical","mining"],
-  "snc": ["civil","mechanical","electrical","chemical"],
-  "snc-lavalin": ["civil","mechanical","electrical","chemical"],
-  "atkinsr\u00E9alis": ["civil","mechanical","electrical","chemical"],
-  "aecom": ["civil","mechanical","electrical","chemical"],
-  "aecon": ["civil","mechanical","electrical"],
-  "pcl": ["civil","mechanical","industrial"],
-  "ellisdon": ["civil","mechanical","industrial"],
-
-  # Space / Aero
-  "pratt & whitney": ["aerospace","mechanical"],
-  "mda": ["aerospace","mechanical","electrical"],
-
-  # Law
-  "blg": ["law"], "bennett jones": ["law"], "blake, cassels": ["law"], "cassels": ["law"],
-  "stikeman": ["law"], "torys": ["law"], "goodmans": ["law"], "gowling": ["law"],
-  "mccarthy": ["law"], "norton rose": ["law"], "supreme court of canada": ["law"],
-
-  # Consulting / Business
-  "deloitte": ["consulting","business"], "kpmg": ["consulting","business"],
-  "pwc": ["consulting","business"], "ey": ["consulting","business"], "mckinsey": ["consulting"],
-  "bcg": ["consulting"], "bain": ["consulting"], "oliver wyman": ["consulting"],
-}
-
-
-def map_tags(company, role, incoming):
-    out = set()
-    text = (role or "").lower()
-    for b, kws in BUCKETS.items():
-        if any(k in text for k in kws):
-            out.add(b)
-    for t in incoming or []:
-        tl = (t or "").lower().replace(" ", "-")
-        if tl in BUCKETS: out.add(tl)
-        for b in BUCKETS:
-            if tl == b or tl == b.replace("-", " "): out.add(b)
-    cl = (company or "").lower()
-    for key, buckets in COMPANY_HINTS.items():
-        if key in cl:
-            out.update(buckets)
-    return sorted(out) if out else ["general"]
-
-clean = []
-for r in arr:
+    return "Closed" if s in CLOSED else "Open"
+
+# Tag buckets, company hints and level markers live in filters.yaml and are
+# compiled once by classify.py.
+def classifier():
+    return load_classifier(str(FILTERS))
+
+def reject_reason(r) -> str | None:
+    """Why normalize_row drops a row ("internish" / "canadian"), or None if it keeps it."""
+    if not is_internish(r.get("role") or r.get("title") or ""):
+        return "internish"
+    if not is_canadian(r.get("location")):
+        return "canadian"
+    return None
+
+def normalize_row(r):
+    if reject_reason(r):
+        return None
     role = r.get("role") or r.get("title") or ""
     loc  = r.get("location")
-    if not is_internish(role):
-        continue
-    if not is_canadian(loc):
-        continue
-    tags = map_tags(r.get("company"), role, r.get("tags"))
-    clean.append({
+    c = classifier().classify(r.get("company"), role, tuple(r.get("tags") or ()), r.get("level"))
+    first_seen, last_seen = sightings(r)
+    return {
         "company": r.get("company") or "Unknown",
         "role": role,
         "location": loc,
         "country": "Canada",
         "deadline": r.get("deadline") or "Rolling/unspecified",
         "status": norm_status(r.get("status")),
-        "tags": tags,
+        "tags": list(c.tags),
         "url": r.get("url") or r.get("apply_url") or r.get("link"),
-        "level": infer_level(role, tags),
-    })
-
-# de-dupe
-seen = {}
-for c in clean:
-    key = (c["company"].lower(), c["role"].lower(), (c["url"] or "").lower())
-    seen[key] = c
-final = list(seen.values())
-
-OUTPUT.write_text(json.dumps(final, indent=2, ensure_ascii=False))
-print("normalized rows:", len(final))
-if not final:
-    sys.exit("No Canadian intern/co-op rows found after normalization.")
+        "level": c.level,
+        "board": board_key(r),
+        "first_seen": first_seen,
+        "last_seen": last_seen,
+    }
+
+def normalize(rows: Iterable[Dict[str, Any]], cache_path: str | Path = CACHE) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Filter, classify and de-dupe postings. `rows` is iterated twice, so pass a
+    list or a store.Postings view rather than a generator. Returns the
+    normalized rows and whether they are identical to the input.
+    """
+    cache_path = Path(cache_path)
+    # Per-board cache: {board: {"fp": <board fingerprint>, "rows": {<row fp>: normalized row or null}}}.
+    # Boards whose fingerprint is unchanged reuse their rows; the rest are reclassified.
+    # The cache is versioned by the rule tables so editing a keyword list invalidates it.
+    rules_fp = fingerprint([INTERN_RE.pattern, LOCATION_RE.pattern, classifier().fingerprint])
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("rules") != rules_fp:
+        cache = {"rules": rules_fp, "boards": {}}
+
+    # Pass 1 keeps only (board, row fingerprint, sightings) per row, and tallies rejects
+    # (both checks are memoized/compiled, so this is cheap even for cached boards).
+    # Fingerprints leave out first_seen/last_seen, which move every run; they are
+    # re-applied from the input row below.
+    order = []
+    board_rows: Dict[str, List[str]] = {}
+    rejected = {"internish": 0, "canadian": 0}
+    for r in rows:
+        rfp, board = fingerprint(content(r)), board_key(r)
+        order.append((board, rfp, sightings(r)))
+        board_rows.setdefault(board, []).append(rfp)
+        reason = reject_reason(r)
+        if reason:
+            rejected[reason] += 1
+    for reason, n in rejected.items():
+        METRICS.count("rejected", n, stage="normalize", reason=reason)
+
+    boards = {}
+    stale = set()
+    for board, rfps in board_rows.items():
+        fp = fingerprint(sorted(rfps))
+        prev = cache["boards"].get(board)
+        if prev and prev.get("fp") == fp:
+            boards[board] = prev
+        else:
+            stale.add(board)
+            boards[board] = {"fp": fp, "rows": {}}
+    cache["boards"] = boards
+
+    # Pass 2 classifies only rows from boards that changed.
+    if stale:
+        for r in rows:
+            board = board_key(r)
+            if board in stale:
+                boards[board]["rows"][fingerprint(content(r))] = normalize_row(r)
+
+    clean = []
+    for board, rfp, (first_seen, last_seen) in order:
+        c = boards[board]["rows"].get(rfp)
+        if c is not None:
+            clean.append({**c, "first_seen": first_seen, "last_seen": last_seen})
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+    print(f"reclassified {len(stale)}/{len(boards)} boards")
+    METRICS.set("boards_reclassified", len(stale), stage="normalize")
+
+    # de-dupe
+    seen = {}
+    for c in clean:
+        key = (c["company"].lower(), c["role"].lower(), (c["url"] or "").lower())
+        seen[key] = c
+    final = list(seen.values())
+    METRICS.count("rejected", len(clean) - len(final), stage="normalize", reason="duplicate")
+    METRICS.set("rows", len(final), stage="normalize")
+    return final, len(final) == len(order) and all(fingerprint(c) == fingerprint(r) for c, r in zip(final, rows))
+
+# Output field order of normalize_row; the columnar engine builds rows in the same order.
+FIELDS = ("company", "role", "location", "country", "deadline", "status", "tags", "url", "level", "board",
+          "first_seen", "last_seen")
+
+def normalize_columnar(rows: Iterable[Dict[str, Any]], cache_path: str | Path = CACHE) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Same contract and output as normalize(), computed column-wise with pandas:
+    the intern regex, status mapping and de-dupe run as vectorized string/array
+    ops, and location matching and classification run once per distinct value
+    and are broadcast back. Every row is classified (the per-board cache is not
+    read or written, `cache_path` is accepted for symmetry), which is what a
+    bulk refresh of historical rows wants anyway.
+    """
+    import warnings
+    import numpy as np
+    import pandas as pd
+
+    rows = rows if isinstance(rows, list) else list(rows)
+    df = pd.DataFrame(rows, dtype=object)
+    n = len(df)
+
+    def col(name: str) -> "pd.Series":
+        return df[name] if name in df else pd.Series([None] * n, index=df.index, dtype=object)
+
+    def truthy(s: "pd.Series") -> "pd.Series":
+        # Python truthiness, with missing keys (NaN) falsy like r.get() -> None
+        return s.notna() & s.astype(bool)
+
+    def first(*cols: Any) -> "pd.Series":
+        # vectorized `a or b or c`
+        out = cols[-1] if isinstance(cols[-1], pd.Series) else pd.Series([cols[-1]] * n, index=df.index, dtype=object)
+        for c in reversed(cols[:-1]):
+            out = c.where(truthy(c), out)
+        return out.where(out.notna(), None)
+
+    role = first(col("role"), col("title"), "")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)   # "has match groups": only the hit matters here
+        intern = role.str.contains(INTERN_RE, na=False).to_numpy(bool)
+    # resolve each distinct location once; code -1 (missing) indexes the trailing False
+    codes, places = pd.factorize(col("location"))
+    canada = np.array([is_canadian(p) for p in places] + [False], dtype=bool)[codes]
+    keep = intern & canada
+    METRICS.count("rejected", int((~intern).sum()), stage="normalize", reason="internish")
+    METRICS.count("rejected", int((intern & ~canada).sum()), stage="normalize", reason="canadian")
+
+    board = first(col("board"), first(col("source"), "unknown").str.lower())
+    nb = board.nunique()
+    k = df.index[keep]
+    role, board = role[k], board[k]
+    company = first(col("company"))[k]
+    level = first(col("level"))[k]
+    tags = first(col("tags"))[k].map(lambda t: tuple(t) if t else ())
+
+    # classify each distinct (company, role, tags, level) once
+    codes, combos = pd.factorize(pd.Series(list(zip(company, role, tags, level)), dtype=object))
+    c = classifier()
+    out_tags = np.empty(len(combos), dtype=object)   # filled per item: np.array() would stack the tuples
+    out_level = np.empty(len(combos), dtype=object)
+    for i, combo in enumerate(combos):
+        out_tags[i], _, _, out_level[i] = c.classify(*combo)
+    out_tags, out_level = out_tags[codes], out_level[codes]
+
+    status = col("status")[k]
+    closed = truthy(status) & status.where(truthy(status), "").str.strip().str.lower().isin(CLOSED)
+    out = pd.DataFrame({
+        "company": company.where(truthy(company), "Unknown"),
+        "role": role,
+        "location": first(col("location"))[k],
+        "deadline": first(col("deadline"), "Rolling/unspecified")[k],
+        "status": np.where(closed, "Closed", "Open"),
+        "url": first(col("url"), col("apply_url"), col("link"))[k],
+        "board": board,
+        "first_seen": first(col("first_seen"), col("created_at"))[k],
+        "last_seen": first(col("last_seen"), col("updated_at"))[k],
+    }, index=k)
+    print(f"reclassified {nb}/{nb} boards ({len(combos)} distinct postings, columnar)")
+    METRICS.set("boards_reclassified", nb, stage="normalize")
+
+    # de-dupe like the row engine's dict: first occurrence's position, last occurrence's values
+    key = [out["company"].str.lower(), out["role"].str.lower(), out["url"].where(truthy(out["url"]), "").str.lower()]
+    group = pd.DataFrame({"c": key[0], "r": key[1], "u": key[2]}).groupby(["c", "r", "u"], sort=False).ngroup().to_numpy()
+    last = ~pd.Series(group).duplicated(keep="last").to_numpy()
+    pick = np.flatnonzero(last)[np.argsort(group[last], kind="stable")]
+
+    out["country"], out["tags"], out["level"] = "Canada", out_tags, out_level
+    # tags become a fresh list per row, as normalize_row returns them
+    final = [dict(zip(FIELDS, v), tags=list(v[6])) for v in zip(*(out[f].to_numpy(object)[pick] for f in FIELDS))]
+    METRICS.count("rejected", len(out) - len(final), stage="normalize", reason="duplicate")
+    METRICS.set("rows", len(final), stage="normalize")
+    unchanged = len(final) == n and all(fingerprint(a) == fingerprint(b) for a, b in zip(final, rows))
+    return final, unchanged
+
+ENGINES = {"rows": normalize, "columnar": normalize_columnar}
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Filter, classify and de-dupe the postings store")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="rows",
+                    help="rows: per-row with a per-board cache; columnar: vectorized with pandas (bulk refreshes)")
+    args = ap.parse_args()
+    if not INPUT.exists():
+        sys.exit(f"{INPUT} is missing")
+    final, unchanged = ENGINES[args.engine](Postings(INPUT))
+    if unchanged:
+        print("normalized rows unchanged; skipping write")
+    else:
+        write_postings(OUTPUT, final)
+    print("normalized rows:", len(final))
+    if not final:
+        sys.exit("No Canadian intern/co-op rows found after normalization.")
+
+if __name__ == "__main__":
+    main()
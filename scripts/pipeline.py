@@ -0,0 +1,183 @@
+# scripts/pipeline.py
+from __future__ import annotations
+import argparse, sys, time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from metrics import METRICS, write_report, write_textfile
+from store import POSTINGS, Postings, write_postings
+
+# Runs scrape -> normalize -> dedup -> links -> render in one process on shared
+# in-memory rows.
+# Each stage imports its module on first use, so e.g. a render-only run never
+# loads requests, and a scrape-only run never loads jinja2.
+
+STAGES = ("scrape", "normalize", "dedup", "links", "render")
+
+class Context:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self._filters: Dict[str, Any] | None = None
+        # until a stage produces rows, read them lazily from the store
+        self.rows: Any = Postings(args.postings) if Path(args.postings).exists() else []
+
+    @property
+    def filters(self) -> Dict[str, Any]:
+        if self._filters is None:
+            import yaml
+            with open(self.args.filters, "r", encoding="utf-8") as f:
+                self._filters = yaml.safe_load(f) or {}
+        return self._filters
+
+def stage_scrape(ctx: Context) -> None:
+    from scraper import scrape, DEFAULT_WORKERS, DEFAULT_PER_HOST, DEFAULT_RATE, DEFAULT_RETRIES, MANUAL_CACHE
+    from http_cache import ResponseCache
+    a = ctx.args
+    cache = None if a.no_cache else ResponseCache(a.cache_dir)
+    ctx.rows = scrape(ctx.filters, ctx.rows, workers=a.workers or DEFAULT_WORKERS,
+                      per_host=a.per_host or DEFAULT_PER_HOST, cache=cache,
+                      rate=a.rate or DEFAULT_RATE, retries=DEFAULT_RETRIES if a.retries is None else a.retries,
+                      manual_cache=None if a.no_manual else MANUAL_CACHE)
+
+def stage_normalize(ctx: Context) -> None:
+    from normalize import ENGINES
+    ctx.rows, _ = ENGINES[ctx.args.engine](ctx.rows)
+    if not ctx.rows:
+        sys.exit("No Canadian intern/co-op rows found after normalization.")
+
+def stage_dedup(ctx: Context) -> None:
+    import json
+    from dedup import dedup, DEFAULT_THRESHOLD
+    rows = list(ctx.rows)
+    kept, report = dedup(rows, ctx.args.dedup_threshold or DEFAULT_THRESHOLD)
+    n = len(rows) - len(kept)
+    if ctx.args.dedup_merge:
+        ctx.rows = kept
+        print(f"[dedup] merged {n} near-duplicates in {len(report)} clusters")
+        METRICS.count("rejected", n, stage="dedup", reason="near_duplicate")
+    else:
+        # report-only unless asked: a wrong merge silently deletes a posting
+        ctx.rows = rows
+        print(f"[dedup] would merge {n} near-duplicates in {len(report)} clusters (pass --dedup-merge to apply)")
+    METRICS.set("rows", len(ctx.rows), stage="dedup")
+    if ctx.args.dedup_report:
+        Path(ctx.args.dedup_report).parent.mkdir(parents=True, exist_ok=True)
+        Path(ctx.args.dedup_report).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+def stage_links(ctx: Context) -> None:
+    from linkcheck import check_links, CACHE, DEFAULT_WORKERS
+    from fetcher import Fetcher, DEFAULT_PER_HOST
+    from throttle import DEFAULT_RATE
+    a = ctx.args
+    with Fetcher(workers=a.link_workers or DEFAULT_WORKERS, per_host=a.per_host or DEFAULT_PER_HOST,
+                 rate=a.rate or DEFAULT_RATE, retries=1) as fetcher:
+        ctx.rows = check_links(ctx.rows, fetcher, CACHE, a.link_ttl * 3600)
+
+def stage_render(ctx: Context) -> None:
+    from render_readme import render
+    render(ctx.rows, ctx.filters, output=ctx.args.readme, manifest_path=ctx.args.manifest)
+
+RUNNERS: Dict[str, Callable[[Context], None]] = {
+    "scrape": stage_scrape,
+    "normalize": stage_normalize,
+    "dedup": stage_dedup,
+    "links": stage_links,
+    "render": stage_render,
+}
+
+def parse_stages(spec: str) -> List[str]:
+    wanted = [s.strip() for s in spec.split(",") if s.strip()]
+    unknown = [s for s in wanted if s not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stage(s): {', '.join(unknown)}")
+    return [s for s in STAGES if s in wanted]  # always run in pipeline order
+
+def main():
+    from http_cache import DEFAULT_CACHE_DIR
+    from manifest import MANIFEST
+
+    ap = argparse.ArgumentParser(description="Run scrape → normalize → render in one process")
+    ap.add_argument("--stages", type=parse_stages, default=list(STAGES),
+                    help="Comma-separated subset of: " + ",".join(STAGES))
+    ap.add_argument("--save", action="append", choices=["scrape", "normalize", "dedup", "links"], default=[],
+                    help="Write the postings store after this stage (repeatable)")
+    ap.add_argument("--filters", default="filters.yaml")
+    ap.add_argument("--postings", default=str(POSTINGS), help="Postings store to read and (with --save) write")
+    ap.add_argument("--readme", default="README.md")
+    ap.add_argument("--manifest", default=str(MANIFEST))
+    ap.add_argument("--workers", type=int, default=None, help="Max concurrent board fetches")
+    ap.add_argument("--per-host", type=int, default=None, help="Max concurrent fetches per ATS host")
+    ap.add_argument("--rate", type=float, default=None, help="Max requests/second per ATS host")
+    ap.add_argument("--retries", type=int, default=None, help="Retries per board on 429/5xx/network errors")
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--no-manual", action="store_true", help="Skip the manual: career pages")
+    ap.add_argument("--engine", choices=["rows", "columnar"], default="rows",
+                    help="Normalize engine: per-row with a per-board cache, or vectorized with pandas")
+    ap.add_argument("--dedup-threshold", type=float, default=None, help="Jaccard similarity for near-duplicates (default 0.8)")
+    ap.add_argument("--dedup-merge", action="store_true",
+                    help="Drop near-duplicates in the dedup stage (default: only report them)")
+    ap.add_argument("--dedup-report", default=None, help="Write near-duplicate clusters to this JSON file")
+    ap.add_argument("--link-ttl", type=float, default=24.0, help="Hours before a posting URL is rechecked")
+    ap.add_argument("--link-workers", type=int, default=None, help="Max concurrent link checks (default 64)")
+    ap.add_argument("--db", default=None, help="Also upsert the final rows into this SQLite history")
+    ap.add_argument("--index", default=None, help="Also write the query index export (see query.py) to this file")
+    ap.add_argument("--report", default=None, help="Write a JSON run report (stage times, per-board stats, rejects)")
+    ap.add_argument("--metrics-textfile", default=None, help="Write the run metrics as a Prometheus textfile")
+    ap.add_argument("--profile", default=None, metavar="PATH",
+                    help="Run under cProfile, dump stats to PATH and print the hottest functions")
+    args = ap.parse_args()
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        run(args)
+    finally:
+        if profiler is not None:
+            import pstats
+            profiler.disable()
+            Path(args.profile).parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(args.profile)
+            print(f"[pipeline] profile → {args.profile} (hottest functions in scripts/ by own time):")
+            pstats.Stats(profiler).sort_stats("tottime").print_stats(r"scripts", 25)
+        # also on sys.exit (e.g. nothing left after normalize), so a bad run still reports
+        if args.report:
+            write_report(args.report)
+            print(f"[pipeline] run report → {args.report}")
+        if args.metrics_textfile:
+            write_textfile(args.metrics_textfile)
+            print(f"[pipeline] metrics → {args.metrics_textfile}")
+
+def run(args: argparse.Namespace) -> None:
+    ctx = Context(args)
+    t_start = time.perf_counter()
+    for name in args.stages:
+        t0 = time.perf_counter()
+        with METRICS.stage(name):
+            RUNNERS[name](ctx)
+            if name in args.save:
+                n = write_postings(args.postings, ctx.rows)
+                print(f"[pipeline] saved {n} postings → {args.postings}")
+        print(f"[pipeline] {name}: {time.perf_counter() - t0:.2f}s")
+    if args.db and set(args.stages) & {"scrape", "normalize", "dedup", "links"}:
+        import db
+        t0 = time.perf_counter()
+        with METRICS.stage("db"):
+            conn = db.connect(args.db)
+            written, total = db.upsert(conn, ctx.rows)
+            conn.close()
+        print(f"[pipeline] db: upserted {written} postings, {total} stored ({time.perf_counter() - t0:.2f}s)")
+    if args.index:
+        from query import Index
+        t0 = time.perf_counter()
+        with METRICS.stage("index"):
+            index = Index.build(ctx.rows)
+            size = index.save(args.index)
+        print(f"[pipeline] index: {len(index.docs)} postings → {args.index} ({size:,} bytes, {time.perf_counter() - t0:.2f}s)")
+    print(f"[pipeline] {len(args.stages)} stage(s) in {time.perf_counter() - t_start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+# scripts/query.py
+from __future__ import annotations
+import argparse, json, re, shlex, sys, time
+from bisect import bisect_left
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from classify import Classifier, load_classifier
+from locations import PROVINCES, resolve
+from manifest import fingerprint
+from normalize import norm_status
+from store import POSTINGS, iter_postings
+
+# In-memory inverted index over normalized postings, for boolean filter queries
+# like "open electrical co-ops in Alberta closing this month":
+#
+#   tag:electrical province:AB status:open deadline:2026-10
+#
+# Terms are AND'ed; comma-separated values within a term are OR'ed
+# (tag:electrical,mechanical); a leading "-" negates (-company:"Hatch").
+# Deadlines take an ISO date or prefix with :, <, <=, > or >=, and also
+# "today" / "+30d" (deadline<=+30d).
+#
+# Every (field, value) maps to a bitmap: a Python int with bit i set for doc i,
+# so a query is a few big-int &/|/~ operations however many rows match. Docs
+# are numbered in deadline order (dated first, soonest first), so a deadline
+# range is a contiguous run of ids -- one mask, found by bisecting the dates.
+#
+# Index.save() writes a compact JSON export for static front-ends: docs as
+# arrays in `fields` order, posting lists as delta-encoded ids, and `dates`,
+# the ascending deadlines of docs 0..len(dates)-1 (the rest are undated).
+# The export carries a content `fingerprint` rather than a build time, so a
+# rebuild over the same postings leaves the file byte-identical.
+
+INDEX = Path("data/index.json")
+FORMAT = 1
+MAX_LIMIT = 500   # results per /search response
+FIELDS = ("tag", "category", "discipline", "level", "province", "company", "status")
+DOC_FIELDS = ("company", "role", "location", "province", "deadline", "status", "level",
+              "category", "discipline", "tags", "url")
+ALIASES = {"tags": "tag", "cat": "category", "prov": "province", "due": "deadline"}
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+TERM_RE = re.compile(r"^(?P<neg>-)?(?P<field>\w+)\s*(?P<op><=|>=|<|>|:|=)\s*(?P<value>.+)$")
+TOP = "~"   # sorts after every ISO date and date prefix
+
+class Clause(NamedTuple):
+    field: str                  # one of FIELDS, or "deadline"
+    values: Tuple[str, ...]     # OR'ed; for "deadline", a half-open [lo, hi) range of ISO strings
+    negate: bool = False
+
+def _deadline(d: Any) -> str | None:
+    m = DATE_RE.match(d) if isinstance(d, str) else None
+    return m.group(0) if m else None
+
+def _doc(r: Dict[str, Any], classifier: Classifier) -> Dict[str, Any]:
+    role = r.get("role") or r.get("title") or ""
+    tags = [t for t in r.get("tags") or () if isinstance(t, str)]
+    category, discipline = classifier.category(tags)
+    return {
+        "company": r.get("company") or "Unknown",
+        "role": role,
+        "location": r.get("location"),
+        "province": resolve(r.get("location")).province,
+        "deadline": r.get("deadline"),
+        "status": norm_status(r.get("status")),
+        "level": classifier.level(role, tags, r.get("level")),
+        "category": category,
+        "discipline": discipline,
+        "tags": tags,
+        "url": r.get("url") or r.get("apply_url") or r.get("link"),
+    }
+
+def _terms(d: Dict[str, Any]) -> Iterable[Tuple[str, str]]:
+    for t in d["tags"]:
+        yield "tag", t.lower()
+    for f in FIELDS[1:]:
+        if d[f]:
+            yield f, d[f].lower()
+
+def _value(field: str, v: str) -> str:
+    v = " ".join(v.lower().split())
+    if field == "province":
+        return PROVINCES.get(v, v).lower()
+    if field == "level" and v in {"ug", "undergrad"}:
+        return "undergraduate"
+    if field == "level" and v == "grad":
+        return "graduate"
+    return v
+
+def _day(v: str, today: date) -> str:
+    v = v.strip().lower()
+    if v == "today":
+        return today.isoformat()
+    m = re.fullmatch(r"([+-]\d+)d", v)
+    return (today + timedelta(days=int(m.group(1)))).isoformat() if m else v
+
+def clause(field: str, value: str | Sequence[str], op: str = ":", negate: bool = False,
+           today: date | None = None) -> Clause:
+    """One filter term; `value` may be a list (OR'ed) or a comma-separated string."""
+    field = ALIASES.get(field.lower(), field.lower())
+    if field == "deadline":
+        d = _day(value if isinstance(value, str) else value[0], today or date.today())
+        lo, hi = {":": (d, d + TOP), "=": (d, d + TOP), "<": ("", d), "<=": ("", d + TOP),
+                  ">": (d + TOP, TOP), ">=": (d, TOP)}[op]
+        return Clause(field, (lo, hi), negate)
+    if field not in FIELDS:
+        raise ValueError(f"unknown field {field!r} (expected one of: {', '.join(FIELDS + ('deadline',))})")
+    if op not in (":", "="):
+        raise ValueError(f"{field} only supports {field}:value")
+    values = value.split(",") if isinstance(value, str) else value
+    return Clause(field, tuple(_value(field, v) for v in values if v.strip()), negate)
+
+def parse(q: str, today: date | None = None) -> List[Clause]:
+    """Parse a query string ("tag:electrical province:AB -status:closed deadline<=+30d")."""
+    out = []
+    for tok in shlex.split(q):
+        m = TERM_RE.match(tok)
+        if not m:
+            raise ValueError(f"cannot parse {tok!r}; expected field:value")
+        out.append(clause(m["field"], m["value"], m["op"], bool(m["neg"]), today))
+    return out
+
+def argv_query(args: Sequence[str]) -> str:
+    """
+    Query string for command-line terms. The shell has already unquoted them,
+    so an argument is one term (company:"Pratt & Whitney Canada" arrives as
+    `company:Pratt & Whitney Canada`) unless it splits into nothing but terms,
+    as a whole query passed in one pair of quotes does.
+    """
+    terms: List[str] = []
+    for arg in args:
+        try:
+            toks = shlex.split(arg)
+        except ValueError:   # a lone apostrophe, as in company:O'Neil
+            toks = []
+        terms.extend(toks if toks and all(TERM_RE.match(t) for t in toks) else [arg])
+    return shlex.join(terms)
+
+def _bitmap(ids: Iterable[int], n: int) -> int:
+    # set bits in a bytearray and convert once; OR-ing 1 << i per id is quadratic
+    buf = bytearray((n + 7) // 8)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+def _bits(bm: int, limit: int | None = None) -> List[int]:
+    s = bin(bm)[:1:-1]   # bit i at position i
+    out: List[int] = []
+    i = s.find("1")
+    while i != -1 and (limit is None or len(out) < limit):
+        out.append(i)
+        i = s.find("1", i + 1)
+    return out
+
+class Index:
+    def __init__(self, docs: List[Dict[str, Any]], dates: List[str], bitmaps: Dict[str, Dict[str, int]]):
+        self.docs = docs
+        self.dates = dates
+        self.bitmaps = bitmaps
+        self.all = (1 << len(docs)) - 1
+
+    @classmethod
+    def build(cls, rows: Iterable[Dict[str, Any]], classifier: Classifier | None = None) -> "Index":
+        classifier = classifier or load_classifier()
+        docs = [_doc(r, classifier) for r in rows]
+        docs.sort(key=lambda d: (_deadline(d["deadline"]) or TOP, d["company"].lower(), d["role"].lower()))
+        dates = [d for d in map(_deadline, (d["deadline"] for d in docs)) if d]
+        ids: Dict[str, Dict[str, List[int]]] = {f: {} for f in FIELDS}
+        for i, d in enumerate(docs):
+            for f, v in _terms(d):
+                ids[f].setdefault(v, []).append(i)
+        n = len(docs)
+        return cls(docs, dates, {f: {v: _bitmap(l, n) for v, l in vs.items()} for f, vs in ids.items()})
+
+    @classmethod
+    def load(cls, path: str | Path = INDEX) -> "Index":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("format") != FORMAT:
+            raise ValueError(f"{path}: unsupported index format {data.get('format')!r}")
+        docs = [dict(zip(data["fields"], row)) for row in data["docs"]]
+        n = len(docs)
+        return cls(docs, data["dates"], {f: {v: _bitmap(accumulate(gaps), n) for v, gaps in vs.items()}
+                                         for f, vs in data["postings"].items()})
+
+    def export(self) -> Dict[str, Any]:
+        def gaps(bm: int) -> List[int]:
+            ids = _bits(bm)
+            return [b - a for a, b in zip([0] + ids, ids)]
+        body = {
+            "count": len(self.docs),
+            "fields": list(DOC_FIELDS),
+            "docs": [[d[f] for f in DOC_FIELDS] for d in self.docs],
+            "dates": self.dates,
+            "postings": {f: {v: gaps(bm) for v, bm in sorted(vs.items())} for f, vs in self.bitmaps.items()},
+        }
+        return {"format": FORMAT, "fingerprint": fingerprint(body), **body}
+
+    def save(self, path: str | Path = INDEX) -> int:
+        """Write the compact export unless the file already holds it; returns its size in bytes."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        raw = json.dumps(self.export(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        try:
+            unchanged = path.read_bytes() == raw
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            path.write_bytes(raw)
+        return len(raw)
+
+    def _match(self, c: Clause) -> int:
+        if c.field == "deadline":
+            lo, hi = (bisect_left(self.dates, x) for x in c.values)
+            return ((1 << hi) - 1) ^ ((1 << lo) - 1) if hi > lo else 0
+        vs = self.bitmaps.get(c.field) or {}
+        bm = 0
+        for v in c.values:
+            bm |= vs.get(v, 0)
+        return bm
+
+    def match(self, clauses: Iterable[Clause]) -> int:
+        """Bitmap of the docs matching every clause."""
+        bm = self.all
+        for c in clauses:
+            bm = bm & ~self._match(c) if c.negate else bm & self._match(c)
+        return bm
+
+    def facets(self, bm: int, field: str) -> Dict[str, int]:
+        counts = ((v, (bm & b).bit_count()) for v, b in (self.bitmaps.get(field) or {}).items())
+        return dict(sorted(((v, n) for v, n in counts if n), key=lambda x: (-x[1], x[0])))
+
+    def search(self, q: str | Iterable[Clause] = "", limit: int | None = 50, offset: int = 0,
+               facets: Sequence[str] = ()) -> Dict[str, Any]:
+        """Matches in deadline order, with the total and optional per-field counts."""
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("limit and offset must not be negative")
+        t0 = time.perf_counter()
+        bm = self.match(parse(q) if isinstance(q, str) else q)
+        ids = _bits(bm, None if limit is None else offset + limit)[offset:]
+        out = {"total": bm.bit_count(), "results": [self.docs[i] for i in ids],
+               "facets": {f: self.facets(bm, f) for f in facets}}
+        out["took_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        return out
+
+    def filter(self, limit: int | None = None, **terms: Any) -> List[Dict[str, Any]]:
+        """
+        Keyword form of search(): filter(tag=["electrical", "mechanical"], province="AB",
+        status="open", deadline="<=2026-10-31", not_company="Hatch").
+        """
+        clauses = []
+        for k, v in terms.items():
+            negate = k.startswith("not_")
+            field = k[4:] if negate else k
+            op = ":"
+            if ALIASES.get(field, field) == "deadline" and isinstance(v, str):
+                m = re.match(r"^(<=|>=|<|>|:|=)?\s*(.+)$", v)
+                op, v = m.group(1) or ":", m.group(2)
+            clauses.append(clause(field, v, op, negate))
+        return self.search(clauses, limit)["results"]
+
+def load(index: str | Path | None = None, postings: str | Path = POSTINGS) -> Index:
+    """The exported index if given, else one built from the postings store."""
+    return Index.load(index) if index else Index.build(iter_postings(postings))
+
+def _print(res: Dict[str, Any]) -> None:
+    for d in res["results"]:
+        deadline = _deadline(d["deadline"]) or "rolling"
+        print(f"{deadline:<10}  {d['status']:<6}  {d['company']} — {d['role']} ({d['location'] or '-'})  {d['url'] or ''}")
+    for f, counts in res["facets"].items():
+        print(f"{f}: " + ", ".join(f"{v} {n}" for v, n in counts.items()))
+    print(f"[query] {res['total']} matches in {res['took_ms']} ms")
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: Tuple[str, int], index: Index):
+        super().__init__(addr, Handler)
+        self.index = index
+        self.export = json.dumps(index.export(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+class Handler(BaseHTTPRequestHandler):
+    server: QueryServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: Any) -> None:
+        raw = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/index.json":
+            return self._send(200, self.server.export)
+        if url.path != "/search":
+            return self._send(404, {"error": "not found; try /search?q=... or /index.json"})
+        qs = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            limit, offset = min(int(qs.get("limit", 50)), MAX_LIMIT), int(qs.get("offset", 0))
+            facets = [f for f in qs.get("facets", "").split(",") if f]
+            return self._send(200, self.server.index.search(qs.get("q", ""), limit, offset, facets))
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+
+def serve(index: Index, host: str = "127.0.0.1", port: int = 8765) -> QueryServer:
+    return QueryServer((host, port), index)
+
+def main():
+    ap = argparse.ArgumentParser(description="Query normalized postings through an in-memory inverted index")
+    ap.add_argument("--postings", default=str(POSTINGS), help="Postings store to index")
+    ap.add_argument("--index", default=None, help="Load this exported index instead of building one")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_search = sub.add_parser("search", help='Run a query, e.g. "tag:electrical province:AB status:open deadline:2026-10"')
+    p_search.add_argument("query", nargs="*")
+    p_search.add_argument("--limit", type=int, default=50)
+    p_search.add_argument("--facets", default="", help="Comma-separated fields to count matches by")
+    p_search.add_argument("--json", action="store_true", help="Print the result as JSON")
+    p_build = sub.add_parser("build", help="Write the compact index export for static front-ends")
+    p_build.add_argument("output", nargs="?", default=str(INDEX))
+    p_serve = sub.add_parser("serve", help=f"Serve GET /search?q=...&limit=&offset=&facets= (limit <= {MAX_LIMIT}) and /index.json")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    index = load(args.index, args.postings)
+    loaded = time.perf_counter() - t0
+    if args.cmd == "build":
+        size = index.save(args.output)
+        print(f"[query] indexed {len(index.docs)} postings in {loaded:.2f}s → {args.output} ({size:,} bytes)")
+    elif args.cmd == "search":
+        try:
+            res = index.search(argv_query(args.query), args.limit, facets=[f for f in args.facets.split(",") if f])
+        except ValueError as e:
+            sys.exit(f"[query] {e}")
+        if args.json:
+            print(json.dumps(res, indent=2, ensure_ascii=False))
+        else:
+            _print(res)
+    else:
+        srv = serve(index, args.host, args.port)
+        print(f"[query] {len(index.docs)} postings on {srv.url}/search?q=... ; Ctrl-C to stop")
+        try:
+            srv.serve_forever()
+        except KeyboardInterrupt:
+            srv.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# scripts/records.py
+from __future__ import annotations
+import json, sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+FIELDS = ("company", "role", "location", "country", "deadline", "status", "tags", "url", "level", "board",
+          "first_seen", "last_seen")
+# When a posting was first and last fetched. They move on every run without the
+# posting changing, so change detection (normalize's cache, render) ignores them.
+SEEN = ("first_seen", "last_seen")
+TS_FORMAT = "%Y-%m-%d %H:%M UTC"   # same format as created_at/updated_at on hand-entered rows
+
+def now() -> str:
+    return datetime.now(timezone.utc).strftime(TS_FORMAT)
+
+def sightings(r: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """(first_seen, last_seen), seeded from created_at/updated_at on hand-entered rows."""
+    return r.get("first_seen") or r.get("created_at"), r.get("last_seen") or r.get("updated_at")
+
+def content(r: Dict[str, Any]) -> Dict[str, Any]:
+    """The row without its first_seen/last_seen."""
+    return {k: v for k, v in r.items() if k not in SEEN} if "first_seen" in r or "last_seen" in r else r
+
+def _intern(s: Any) -> Optional[str]:
+    return sys.intern(s) if isinstance(s, str) else s
+
+@dataclass(slots=True)
+class Posting:
+    """
+    Compact posting record. Fields that repeat across thousands of rows
+    (company, location, country, deadline, status, level, board, every tag)
+    are interned so all rows share one string object per distinct value, and
+    tags are a tuple instead of a list. Same keys as the dicts the scrapers emit.
+    """
+    company: str
+    role: str
+    location: Optional[str] = None
+    country: Optional[str] = None
+    deadline: Optional[str] = None
+    status: str = "Open"
+    tags: Tuple[str, ...] = ()
+    url: Optional[str] = None
+    level: Optional[str] = None
+    board: Optional[str] = None
+    first_seen: Optional[str] = None
+    last_seen: Optional[str] = None
+
+    def __post_init__(self):
+        self.company = _intern(self.company)
+        self.location = _intern(self.location)
+        self.country = _intern(self.country)
+        self.deadline = _intern(self.deadline)
+        self.status = _intern(self.status)
+        self.level = _intern(self.level)
+        self.board = _intern(self.board)
+        self.first_seen = _intern(self.first_seen)
+        self.last_seen = _intern(self.last_seen)
+        self.tags = tuple(sys.intern(t) for t in self.tags or () if isinstance(t, str))
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Case-insensitive (company, role, url) de-dupe key."""
+        return ((self.company or "").lower(), (self.role or "").lower(), str(self.url or "").lower())
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Posting":
+        return cls(**{f: d[f] for f in FIELDS if f in d})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: (list(self.tags) if f == "tags" else getattr(self, f)) for f in FIELDS}
+
+    @classmethod
+    def from_json(cls, line: str) -> "Posting":
+        return cls.from_dict(json.loads(line))
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+def _bench(sizes: Iterable[int]) -> None:
+    import gc, random, tracemalloc
+    rnd = random.Random(42)
+    companies = [f"Company {i}" for i in range(800)]
+    places = ["Toronto, ON", "Vancouver, BC", "Montréal, QC", "Ottawa, ON", "Calgary, AB", "Canada", "Waterloo, ON"]
+    tags = ["software", "electrical", "mechanical", "data-ml-ai", "business", "law", "civil", "general"]
+
+    def lines(n):
+        # JSON round-trip so every row owns fresh string objects, as when read from disk
+        for i in range(n):
+            yield json.dumps({
+                "company": rnd.choice(companies), "role": f"Engineering Intern {i % 5000}",
+                "location": rnd.choice(places), "country": "Canada", "deadline": "Rolling/unspecified",
+                "status": rnd.choice(["Open", "Closed"]), "tags": rnd.sample(tags, rnd.randint(1, 3)),
+                "url": f"https://boards.example.com/jobs/{i}", "level": "Undergraduate", "board": "greenhouse:example",
+            })
+
+    def measure(build, n):
+        gc.collect()
+        tracemalloc.start()
+        rows = build(lines(n))
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows
+        gc.collect()
+        return size
+
+    for n in sizes:
+        d = measure(lambda ls: [json.loads(l) for l in ls], n)
+        p = measure(lambda ls: [Posting.from_json(l) for l in ls], n)
+        print(f"{n:>9,} rows  dict: {d / 2**20:8.1f} MiB ({d / n:5.0f} B/row)   "
+              f"Posting: {p / 2**20:8.1f} MiB ({p / n:5.0f} B/row)   saved {1 - p / d:.0%}")
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Memory benchmark: dict rows vs Posting records")
+    ap.add_argument("--sizes", default="100000,1000000", help="Comma-separated row counts")
+    args = ap.parse_args()
+    _bench(int(x) for x in args.sizes.split(","))
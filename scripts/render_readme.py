@@ -1,97 +1,33 @@
 # scripts/render_readme.py
 from __future__ import annotations
-import json, yaml, os, sys
+import json, yaml, os, sys, time
 from datetime import datetime
 from collections import defaultdict
-from jinja2 import Environment, FileSystemLoader
+from typing import Iterable
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from classify import Classifier
+from locations import is_canadian
+from manifest import MANIFEST, fingerprint, load_manifest, save_manifest
+from records import content
+from metrics import METRICS
+from store import POSTINGS, Postings
 
 # ---- inputs ----
-RAW_POSTINGS = os.environ.get("POSTINGS_JSON", "data/postings.json")   # [{...}]
+RAW_POSTINGS = os.environ.get("POSTINGS_JSON", str(POSTINGS))          # NDJSON or legacy JSON
 FILTERS_YAML = os.environ.get("FILTERS_YAML", "filters.yaml")          # your filters file
 TEMPLATE_DIR = os.environ.get("TEMPLATE_DIR", "templates")
 TEMPLATE_NAME = os.environ.get("TEMPLATE_NAME", "readme.j2")
+SECTION_TEMPLATE = os.environ.get("SECTION_TEMPLATE", "section.j2")
+CACHE_DIR = os.environ.get("RENDER_CACHE_DIR", ".cache/render")   # compiled templates + section fragments
 OUTPUT = os.environ.get("OUTPUT", "README.md")
+MANIFEST_JSON = os.environ.get("MANIFEST_JSON", str(MANIFEST))
 
 # ---- helpers ----
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
 def load_yaml(path):
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
-def infer_category_and_discipline(tags: list[str], tag_buckets: dict) -> tuple[str, str]:
-    """
-    Category = one of: Engineering, Law, Consulting, Business (you can add more)
-    Discipline = for Engineering: Electrical, Chemical, Mechanical, etc.
-    For Law/Consulting/Business we keep Discipline = "General" unless you want sub‑splits later.
-    """
-    tags_lower = {t.lower() for t in (tags or [])}
-
-    # buckets
-    eng_disciplines = {
-        "electrical": "Electrical",
-        "mechanical": "Mechanical",
-        "civil": "Civil",
-        "chemical": "Chemical",
-        "mechatronics": "Mechatronics / Robotics",
-        "industrial": "Industrial / Manufacturing",
-        "aerospace": "Aerospace",
-        "mining": "Mining / Metallurgy",
-        "hardware-embedded": "Hardware / Embedded",
-        "data-ml-ai": "Data / ML / AI",
-        "software": "Software",
-    }
-    law_keys = set(tag_buckets.get("law", []))
-    consulting_keys = set(tag_buckets.get("consulting", []))
-
-    # detect Engineering discipline first
-    for key, disp in eng_disciplines.items():
-        if any(t in tags_lower for t in tag_buckets.get(key, [])):
-            return ("Engineering", disp)
-
-    # law
-    if any(t in tags_lower for t in law_keys):
-        return ("Law", "General")
-
-    # consulting
-    if any(t in tags_lower for t in consulting_keys):
-        return ("Consulting", "General")
-
-    # business heuristic: if not engineering/law/consulting and tag hints
-    business_hints = {"finance","accounting","product","operations","marketing","strategy","business"}
-    if tags_lower & business_hints:
-        return ("Business", "General")
-
-    # fallback
-    return ("Other", "General")
-
-def infer_level(meta: dict) -> str:
-    """
-    Return "Undergraduate" or "Graduate".
-    Uses explicit `level` if present, else keyword inference on role/title/tags.
-    """
-    level = (meta.get("level") or "").lower()
-    if "under" in level or level == "ug" or level == "undergraduate":
-        return "Undergraduate"
-    if "grad" in level or "eit" in level or "phd" in level or "master" in level:
-        return "Graduate"
-
-    text = " ".join(filter(None, [
-        meta.get("role",""), meta.get("title",""), " ".join(meta.get("tags", []))
-    ])).lower()
-
-    ug_kw = ["intern","co-op","co op","coop","undergrad","bachelor"]
-    grad_kw = ["eit","graduate","masters","master’s","phd","new grad program"]
-
-    if any(k in text for k in grad_kw):
-        return "Graduate"
-    if any(k in text for k in ug_kw):
-        return "Undergraduate"
-    # default
-    return "Undergraduate"
-
 def normalize_status(s: str | None) -> str:
     s = (s or "open").strip().lower()
     return "closed" if s in {"closed","no longer available","filled"} else "open"
@@ -101,19 +37,20 @@ def sort_key(p):
     d = p.get("deadline") or ""
     return (d if d and len(d) >= 4 else "9999-99-99", p.get("company","").lower())
 
-def build_groups(rows: list[dict], filters: dict) -> dict:
-    tag_buckets = filters.get("categories", {})
+def build_groups(rows: Iterable[dict], filters: dict) -> dict:
+    classifier = Classifier.from_filters(filters)
     groups = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))  # cat -> disc -> level -> list
 
+    not_canadian = 0
     for r in rows:
         # Skip anything not Canada (your scraper should already filter, this is a safety net)
-        country = (r.get("country") or r.get("location") or "").lower()
-        if "canada" not in country and not any(k in country for k in ["on","qc","bc","ab","sk","mb","nb","ns","nl","pe","yt","nt","nu","toronto","montreal","vancouver","calgary","edmonton","ottawa","waterloo"]):
+        if not is_canadian(r.get("country") or r.get("location")):
+            not_canadian += 1
             continue
 
         tags = r.get("tags") or []
-        category, discipline = infer_category_and_discipline(tags, tag_buckets)
-        level = infer_level(r)
+        category, discipline = classifier.category(tags)
+        level = classifier.level(r.get("role") or r.get("title"), tags, r.get("level"))
         status = normalize_status(r.get("status"))
 
         post = {
@@ -133,22 +70,92 @@ def build_groups(rows: list[dict], filters: dict) -> dict:
             for lvl, posts in disc.items():
                 posts.sort(key=sort_key)
 
+    METRICS.count("rejected", not_canadian, stage="render", reason="canadian")
     return groups
 
-def main():
-    rows = load_json(RAW_POSTINGS)   # expects a list of postings from your scraper
-    filters = load_yaml(FILTERS_YAML)
+def template_source(name: str) -> str:
+    with open(os.path.join(TEMPLATE_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+def make_env() -> Environment:
+    # compiled templates persist across runs in the bytecode cache
+    os.makedirs(os.path.join(CACHE_DIR, "jinja"), exist_ok=True)
+    return Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=False, trim_blocks=True,
+                       lstrip_blocks=True, bytecode_cache=FileSystemBytecodeCache(os.path.join(CACHE_DIR, "jinja")))
+
+def render_sections(env: Environment, groups: dict) -> tuple[dict, int, int]:
+    """
+    Render each (category, discipline, level) table, reusing the cached
+    fragment when that section's postings and the section template are
+    unchanged. Returns (sections, reused, rebuilt).
+    """
+    path = os.path.join(CACHE_DIR, "fragments.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    tpl_fp = fingerprint(template_source(SECTION_TEMPLATE))
+    tpl = None
+    sections, fresh = {}, {}
+    reused = rebuilt = 0
+    for cat, discs in groups.items():
+        for disc, levels in discs.items():
+            for lvl, posts in levels.items():
+                key = fingerprint([tpl_fp, cat, disc, lvl, posts])
+                text = cached.get(key)
+                if text is None:
+                    tpl = tpl or env.get_template(SECTION_TEMPLATE)
+                    text = tpl.render(level_name=lvl, postings=posts)
+                    rebuilt += 1
+                else:
+                    reused += 1
+                sections[(cat, disc, lvl)] = fresh[key] = text
+    # only this render's fragments are kept, so the cache never outgrows the README
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fresh, f, ensure_ascii=False)
+    return sections, reused, rebuilt
+
+def render(rows: Iterable[dict], filters: dict, output: str = OUTPUT,
+           manifest_path: str = MANIFEST_JSON) -> bool:
+    """
+    Render the README from postings. `rows` is iterated twice (fingerprint,
+    then grouping), so pass a list or a store.Postings view.
+    Returns False when nothing changed since the last render.
+    """
+    t0 = time.perf_counter()
+    # Skip the render entirely when postings, filters and templates are unchanged
+    render_fp = fingerprint([[fingerprint(content(r)) for r in rows], filters,
+                             template_source(TEMPLATE_NAME), template_source(SECTION_TEMPLATE)])
+    manifest = load_manifest(manifest_path)
+    if manifest.get("render") == render_fp and os.path.exists(output):
+        print(f"{output} is up to date; nothing to render.")
+        return False
+
     groups = build_groups(rows, filters)
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=False, trim_blocks=True, lstrip_blocks=True)
+    env = make_env()
+    sections, reused, rebuilt = render_sections(env, groups)
     tpl = env.get_template(TEMPLATE_NAME)
     md = tpl.render(
         groups=groups,
+        sections=sections,
         generated_at=datetime.now().strftime("%Y-%m-%d")
     )
-    with open(OUTPUT, "w", encoding="utf-8") as f:
+    with open(output, "w", encoding="utf-8") as f:
         f.write(md)
-    print(f"Wrote {OUTPUT} with {sum(len(levels) for disc in groups.values() for levels in disc.values())} sections.")
+    METRICS.set("sections", reused, stage="render", state="reused")
+    METRICS.set("sections", rebuilt, stage="render", state="rebuilt")
+    METRICS.set("readme_bytes", len(md.encode("utf-8")), stage="render")
+    manifest["render"] = render_fp
+    manifest.pop("boards", None)   # per-board fingerprints written by older scrapers; nothing reads them
+    save_manifest(manifest, manifest_path)
+    print(f"Wrote {output} with {len(sections)} sections ({reused} reused, {rebuilt} rebuilt) "
+          f"in {time.perf_counter() - t0:.2f}s.")
+    return True
+
+def main():
+    render(Postings(RAW_POSTINGS), load_yaml(FILTERS_YAML))
 
 if __name__ == "__main__":
     sys.exit(main())
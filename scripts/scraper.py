@@ -1,12 +1,27 @@
 # scripts/scraper.py
 from __future__ import annotations
-import argparse, json, re, time
-from typing import Any, Dict, List
+import argparse, re, time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from pathlib import Path
 
-import requests
 import yaml
 
+from ats import ADAPTERS, Board, board_tasks
+from ats import gh_fetch, gh_to_posting, lever_fetch, lever_to_posting  # noqa: F401 (moved to ats.py; kept importable here)
+from locations import is_canadian
+from fetcher import Fetcher, DEFAULT_WORKERS, DEFAULT_PER_HOST, DEFAULT_RETRIES
+from throttle import DEFAULT_RATE
+from http_cache import ResponseCache, DEFAULT_CACHE_DIR
+from manual import CACHE as MANUAL_CACHE, scrape_manual, sources
+from store import POSTINGS, iter_postings, write_postings
+from records import Posting, now, sightings
+from metrics import METRICS
+from manifest import board_key
+
+# Politeness delay the old serial loop slept after every board; kept only to
+# estimate how long the serial path would have taken.
+SERIAL_DELAY = 0.25
+
 INTERN_RE = re.compile(r"\b(intern(ship)?|co[- ]?op|coop|student|summer|placement)\b", re.I)
 
 def load_yaml(path: str) -> Dict[str, Any]:
@@ -17,167 +32,162 @@ def is_internish(text: str) -> bool:
     return bool(INTERN_RE.search(text or ""))
 
 def looks_canadian(loc: str | None) -> bool:
-    if not loc:
-        return False
-    t = f" {loc.lower()} "
-    if " canada " in t:
-        return True
-    hints = [
-        " toronto "," ontario "," on "," ottawa "," waterloo "," montreal ",
-        " québec "," quebec "," qc "," vancouver "," british columbia "," bc ",
-        " calgary "," edmonton "," alberta "," ab "," manitoba "," mb "," winnipeg ",
-        " saskatchewan "," sk "," regina "," saskatoon "," nova scotia "," ns "," halifax ",
-        " new brunswick "," nb "," pei "," prince edward island "," newfoundland "," nl ",
-        " st. john’s "," st johns "," yukon "," whitehorse "," northwest territories "," nt ",
-        " nunavut "," nu "
-    ]
-    return any(h in t for h in hints)
-
-def gh_fetch(board: str) -> List[Dict[str, Any]]:
-    # Greenhouse board: https://api.greenhouse.io/v1/boards/{board}/jobs
-    url = f"https://api.greenhouse.io/v1/boards/{board}/jobs"
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    data = r.json() or {}
-    return data.get("jobs", [])
-
-def gh_to_posting(j: Dict[str, Any], company_label: str) -> Dict[str, Any]:
-    title = j.get("title") or ""
-    # location may be dict or list
-    loc = None
-    locs = j.get("location")
-    if isinstance(locs, dict):
-        loc = locs.get("name")
-    elif isinstance(locs, list) and locs:
-        loc = (locs[0] or {}).get("name")
-    apply_url = j.get("absolute_url") or j.get("url") or j.get("internal_job_id")
-    return {
-        "company": company_label,
-        "role": title,
-        "location": loc,
-        "country": "Canada" if looks_canadian(loc) else None,
-        "deadline": None,
-        "status": "Open",
-        "tags": [],
-        "url": apply_url,
-        "level": None,
-    }
-
-def lever_fetch(company_slug: str) -> List[Dict[str, Any]]:
-    # Lever: https://api.lever.co/v0/postings/{company}?mode=json
-    url = f"https://api.lever.co/v0/postings/{company_slug}?mode=json"
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    return r.json() or []
-
-def lever_to_posting(j: Dict[str, Any], company_label: str) -> Dict[str, Any]:
-    title = j.get("text") or j.get("title") or ""
-    loc = None
-    if j.get("categories"):
-        loc = j["categories"].get("location")
-    if not loc:
-        locs = j.get("workTypes") or j.get("locations") or []
-        if isinstance(locs, list) and locs:
-            cand = locs[0]
-            if isinstance(cand, dict):
-                loc = cand.get("name")
-            elif isinstance(cand, str):
-                loc = cand
-    apply_url = j.get("hostedUrl") or j.get("applyUrl") or j.get("url")
-    return {
-        "company": company_label,
-        "role": title,
-        "location": loc,
-        "country": "Canada" if looks_canadian(loc) else None,
-        "deadline": None,
-        "status": "Open",
-        "tags": [],
-        "url": apply_url,
-        "level": None,
-    }
+    return is_canadian(loc)
+
+def collect(board: Board, fetcher: Fetcher) -> Tuple[List[Posting], int]:
+    """
+    Stream a board page by page, keeping only Canadian intern/co-op postings.
+    Returns (kept postings, jobs seen) and records the board's fetch stats.
+    """
+    adapter = ADAPTERS[board.source]
+    kept: List[Posting] = []
+    seen = not_intern = not_canada = 0
+    t0, b0 = time.perf_counter(), fetcher.received()
+    for page in adapter.pages(board, fetcher):
+        seen += len(page)
+        for j in page:
+            p = adapter.to_posting(j, board)
+            if not is_internish(p.role):
+                not_intern += 1
+            elif not (p.location and looks_canadian(p.location)):
+                not_canada += 1
+            else:
+                p.board = board.key
+                kept.append(p)
+    METRICS.board(board.key, ok=1, latency_s=round(time.perf_counter() - t0, 4), bytes=fetcher.received() - b0,
+                  jobs=seen, kept=len(kept), rejected_internish=not_intern, rejected_canadian=not_canada)
+    METRICS.count("rejected", not_intern, stage="scrape", reason="internish")
+    METRICS.count("rejected", not_canada, stage="scrape", reason="canadian")
+    return kept, seen
+
+def merge_rows(rows: Iterable[Dict[str, Any]]) -> Iterator[Posting]:
+    """Reshape previously stored postings so they can be merged with fresh ones."""
+    for r in rows:
+        title = r.get("role") or r.get("title") or ""
+        loc = r.get("location")
+        if looks_canadian(loc) and is_internish(title):
+            first, last = sightings(r)
+            yield Posting(
+                company=r.get("company") or "Unknown",
+                role=title,
+                location=loc,
+                country="Canada",
+                deadline=r.get("deadline"),
+                status=r.get("status") or "Open",
+                tags=tuple(r.get("tags") or ()),
+                url=r.get("url") or r.get("apply_url") or r.get("link"),
+                level=r.get("level"),
+                board=board_key(r),
+                first_seen=first,
+                last_seen=last,
+            )
+
+def scrape(cfg: Dict[str, Any], existing: Iterable[Dict[str, Any]] = (),
+           workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+           cache: ResponseCache | None = None, rate: float = DEFAULT_RATE, retries: int = DEFAULT_RETRIES,
+           manual_cache: str | Path | None = MANUAL_CACHE) -> List[Dict[str, Any]]:
+    """
+    Fetch every configured board, merge in `existing` postings and de-dupe.
+    Also scrapes the `manual:` career pages unless `manual_cache` is None.
+    Rows carry their "board" key, which normalize uses to skip unchanged boards.
+    """
+    postings: List[Posting] = []
+
+    # every board under `boards:` in filters.yaml, in config order
+    tasks = board_tasks(cfg)
+
+    t0 = time.perf_counter()
+    with Fetcher(workers=workers, per_host=per_host, cache=cache, rate=rate, retries=retries) as fetcher:
+        results = fetcher.map(lambda b: collect(b, fetcher), tasks)
+        wall = time.perf_counter() - t0
+        manual_rows, manual_failed = scrape_manual(cfg, fetcher, manual_cache) if manual_cache else ([], [])
+    if fetcher.summary():
+        print(f"[scraper] {fetcher.summary()}")
+    if cache is not None and tasks:
+        print(f"[scraper] cache: {cache.hits} not modified, {cache.misses} downloaded")
+
+    # results come back in task order, so output matches the serial path
+    skipped = []
+    seen = 0
+    for board, (res, err, secs) in zip(tasks, results):
+        if err is not None:
+            print(f"[warn] {board.source} fetch failed for {board.label}: {err}")
+            METRICS.board(board.key, ok=0, latency_s=round(secs, 4), error=f"{type(err).__name__}: {err}")
+            skipped.append(board.key)
+            continue
+        postings.extend(res[0])
+        seen += res[1]
+
+    if tasks:
+        serial = sum(secs for _, _, secs in results) + SERIAL_DELAY * len(tasks)
+        print(f"[scraper] fetched {len(tasks)} boards in {wall:.2f}s "
+              f"(serial est. {serial:.2f}s, saved {max(serial - wall, 0.0):.2f}s); "
+              f"kept {len(postings)} of {seen} jobs")
+    postings.extend(manual_rows)
+    skipped.extend(manual_failed)
+    # only what this run actually fetched counts as seen now
+    seen_at = now()
+    for p in postings:
+        p.first_seen = p.last_seen = seen_at
+    if skipped:
+        # previously stored rows for these boards are still merged in below
+        more = f" … +{len(skipped) - 10} more" if len(skipped) > 10 else ""
+        print(f"[scraper] skipped {len(skipped)} boards after retries: {', '.join(skipped[:10])}{more}")
+
+    # a manual page read this run lists all its postings: its other stored rows are
+    # gone from the page, or links an older parse mistook for postings
+    reread = {s.board for s in sources(cfg)} - set(manual_failed) if manual_cache else set()
+    listed = {p.key for p in manual_rows}
+    postings.extend(p for p in merge_rows(existing) if p.board not in reread or p.key in listed)
+
+    # De-dupe by (company, role, url); rows stay compact Posting records until here.
+    # A stored copy of a fetched posting keeps its first_seen; last_seen is the latest sighting.
+    dedup: Dict[tuple, Posting] = {}
+    for p in postings:
+        prev = dedup.get(p.key)
+        if prev is not None:
+            p.first_seen = min(filter(None, (prev.first_seen, p.first_seen)), default=None)
+            p.last_seen = max(filter(None, (prev.last_seen, p.last_seen)), default=None)
+        dedup[p.key] = p
+    rows = [p.to_dict() for p in dedup.values()]
+    METRICS.count("rejected", len(postings) - len(rows), stage="scrape", reason="duplicate")
+    METRICS.set("rows", len(rows), stage="scrape")
+    return rows
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--filters", default="filters.yaml")
-    ap.add_argument("--output", default="data/postings.json")
+    ap.add_argument("--output", default=str(POSTINGS))
     ap.add_argument("--input", default=None, help="Optional: existing postings to merge in")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Max concurrent board fetches")
+    ap.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="Max concurrent fetches per ATS host")
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Max requests/second per ATS host")
+    ap.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per board on 429/5xx/network errors")
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Where to keep conditional-request cache entries")
+    ap.add_argument("--no-cache", action="store_true", help="Always download full board payloads")
+    ap.add_argument("--manual-cache", default=str(MANUAL_CACHE), help="Content hashes of the manual: pages")
+    ap.add_argument("--no-manual", action="store_true", help="Skip the manual: career pages")
     args = ap.parse_args()
 
     cfg = load_yaml(args.filters)
 
-    postings: List[Dict[str, Any]] = []
-
-    # Greenhouse boards
-    for ent in (cfg.get("greenhouse") or []):
-        name = ent.get("name")
-        board = ent.get("board")
-        if not board or not name:
-            continue
-        board_slug = board.rstrip("/").split("/")[-1]
-        try:
-            jobs = gh_fetch(board_slug)
-            for j in jobs:
-                p = gh_to_posting(j, name)
-                if p["location"] and looks_canadian(p["location"]) and is_internish(p["role"]):
-                    postings.append(p)
-        except Exception as e:
-            print(f"[warn] greenhouse fetch failed for {name}: {e}")
-        time.sleep(0.25)
-
-    # Lever boards
-    for ent in (cfg.get("lever") or []):
-        name = ent.get("name")
-        board = ent.get("board")
-        if not board or not name:
-            continue
-        slug = board.rstrip("/").split("/")[-1]
-        try:
-            jobs = lever_fetch(slug)
-            for j in jobs:
-                p = lever_to_posting(j, name)
-                if p["location"] and looks_canadian(p["location"]) and is_internish(p["role"]):
-                    postings.append(p)
-        except Exception as e:
-            print(f"[warn] lever fetch failed for {name}: {e}")
-        time.sleep(0.25)
-
     # Always try to merge existing postings (input and/or current output)
+    existing: List[Dict[str, Any]] = []
     for merge_path in filter(None, [args.input, args.output]):
         pth = Path(merge_path)
         if pth.exists():
             try:
-                existing = json.loads(pth.read_text(encoding="utf-8"))
-                if isinstance(existing, dict) and "items" in existing:
-                    existing = list(existing["items"].values())
-                if isinstance(existing, list):
-                    for r in existing:
-                        title = r.get("role") or r.get("title") or ""
-                        loc = r.get("location")
-                        if looks_canadian(loc) and is_internish(title):
-                            postings.append({
-                                "company": r.get("company") or "Unknown",
-                                "role": title,
-                                "location": loc,
-                                "country": "Canada",
-                                "deadline": r.get("deadline"),
-                                "status": r.get("status") or "Open",
-                                "tags": r.get("tags") or [],
-                                "url": r.get("url") or r.get("apply_url") or r.get("link"),
-                                "level": r.get("level"),
-                            })
+                existing.extend(iter_postings(pth))
             except Exception as e:
                 print(f"[warn] merge read failed for {merge_path}: {e}")
 
-    # De-dupe by (company, role, url)
-    dedup: Dict[tuple, Dict[str, Any]] = {}
-    for r in postings:
-        key = (str(r.get("company","")).lower(), str(r.get("role","")).lower(), str(r.get("url","")).lower())
-        dedup[key] = r
-    postings = list(dedup.values())
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    postings = scrape(cfg, existing, workers=args.workers, per_host=args.per_host,
+                      cache=cache, rate=args.rate, retries=args.retries,
+                      manual_cache=None if args.no_manual else args.manual_cache)
 
-    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-    Path(args.output).write_text(json.dumps(postings, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"[scraper] wrote {len(postings)} postings → {args.output}")
+    n = write_postings(args.output, postings)
+    print(f"[scraper] wrote {n} postings → {args.output}")
 
 if __name__ == "__main__":
     main()
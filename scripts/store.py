@@ -0,0 +1,83 @@
+# scripts/store.py
+from __future__ import annotations
+import argparse, json, os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+# Newline-delimited JSON (one posting per line) is the working format; the
+# older whole-file JSON shapes -- a list, or {"items": {url: posting}} -- are
+# still read and can be written back for anything that expects them.
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+POSTINGS = Path("data/postings.ndjson")
+
+def is_ndjson(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in NDJSON_SUFFIXES
+
+def iter_postings(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Yield postings one at a time from an NDJSON file or either legacy JSON shape."""
+    path = Path(path)
+    if is_ndjson(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for n, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{n}: {e}") from None
+        return
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(raw, dict):
+        raw = (raw.get("items") or {}).values()
+    yield from raw
+
+class Postings:
+    """Re-iterable view of a postings file; every iteration streams it from disk again."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter_postings(self.path)
+
+def write_postings(path: str | Path, rows: Iterable[Dict[str, Any]], shape: str = "list") -> int:
+    """
+    Write rows to path, one record at a time for NDJSON. The file is replaced
+    atomically, so a stage may read and rewrite the same path. `shape` picks the
+    legacy layout ("list" or "items") when path is a .json file.
+    Returns the number of rows written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    n = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        if is_ndjson(path):
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False))
+                f.write("\n")
+                n += 1
+        else:
+            rows = list(rows)
+            n = len(rows)
+            if shape == "items":
+                data: Any = {"items": {r.get("url") or f"row-{i}": r for i, r in enumerate(rows)}}
+            else:
+                data = rows
+            f.write(json.dumps(data, indent=2, ensure_ascii=False))
+    os.replace(tmp, path)
+    return n
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert postings between NDJSON and the legacy JSON shapes")
+    ap.add_argument("src")
+    ap.add_argument("dst")
+    ap.add_argument("--shape", choices=["list", "items"], default="list",
+                    help="Layout when dst is a .json file")
+    args = ap.parse_args()
+    n = write_postings(args.dst, iter_postings(args.src), shape=args.shape)
+    print(f"[store] wrote {n} postings → {args.dst}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# scripts/throttle.py
+from __future__ import annotations
+import random, threading, time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Flow control for the fetcher, one instance of each per ATS host:
+#  - TokenBucket paces requests and adapts to throttling (AIMD: halve the rate
+#    and pause on a 429 / Retry-After, creep back up on every success).
+#  - CircuitBreaker stops sending to a host after repeated failures and lets a
+#    single probe through once the cooldown has passed.
+#  - backoff() is bounded exponential backoff with full jitter.
+
+DEFAULT_RATE = 20.0          # requests/second per host when healthy
+MIN_RATE = 0.5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+MAX_RETRY_AFTER = 120.0      # longer waits than this are not worth holding a board for
+
+class HostUnavailable(RuntimeError):
+    """Raised instead of sending a request while a host's circuit is open."""
+
+class TokenBucket:
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = 4.0, min_rate: float = MIN_RATE):
+        self.max_rate = max(rate, min_rate)
+        self.rate = self.max_rate
+        self.min_rate = min_rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.blocked_until = 0.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """The host pushed back: halve the rate and hold every request for `retry_after`."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; half-opens after `cooldown` seconds."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self._probing = True        # half-open: exactly one trial request
+            return True
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """
+        End a half-open probe that neither succeeded nor failed (a 429, an
+        unexpected exception): the circuit stays open for another cooldown
+        instead of refusing the host forever. No-op when not probing.
+        """
+        with self._lock:
+            if self._probing:
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def failure(self) -> bool:
+        """Record a failure. Returns True if this one opened (or re-opened) the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.monotonic()
+                self._probing = False
+                return True
+            return False
+
+def backoff(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())